@@ -0,0 +1,187 @@
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import os
+import time
+
+PNM_CHANNELS = {b"P5": 1, b"P6": 3}
+
+
+def read_pnm_header(path):
+    """
+    Parses a binary PGM/PPM header and returns (width, height, channels, maxval, data_offset).
+    """
+    with open(path, "rb") as f:
+        head = f.read(512)
+    tokens = []
+    pos = 0
+    while len(tokens) < 4:
+        while head[pos:pos + 1].isspace():
+            pos += 1
+        if head[pos:pos + 1] == b"#":
+            pos = head.find(b"\n", pos) + 1
+            if pos == 0:
+                raise ValueError(f"{path} has a truncated PGM/PPM header")
+            continue
+        end = pos
+        while end < len(head) and not head[end:end + 1].isspace():
+            end += 1
+        if end >= len(head):
+            raise ValueError(f"{path} has a truncated PGM/PPM header")
+        tokens.append(head[pos:end])
+        pos = end
+    magic, width, height, maxval = tokens
+    if magic not in PNM_CHANNELS:
+        raise ValueError(f"{path} is not a binary PGM/PPM file")
+    # exactly one whitespace byte separates the header from the pixel data
+    return int(width), int(height), PNM_CHANNELS[magic], int(maxval), pos + 1
+
+
+def open_raw(path, shape=None, dtype=np.uint8, offset=0):
+    """
+    Opens pixel data as a read-only memory map without decoding it into RAM.
+    .npy and binary .pgm/.ppm files carry their own shape; raw dumps need shape.
+    Anything else is decoded with PIL into an ordinary array.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        return np.load(path, mmap_mode="r")
+    if ext in (".pgm", ".ppm", ".pnm"):
+        width, height, channels, maxval, offset = read_pnm_header(path)
+        dtype = np.uint8 if maxval < 256 else np.dtype(">u2")
+        shape = (height, width) if channels == 1 else (height, width, channels)
+        return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+    if shape is not None:
+        return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=tuple(shape))
+    with Image.open(path) as img:
+        return np.asarray(img)
+
+
+def create_output(path, shape, dtype=np.uint8):
+    """
+    Creates a writable memory-mapped output (.npy, .pgm or .ppm) or, for other
+    extensions and path=None, a plain in-memory array.
+    """
+    ext = os.path.splitext(path)[1].lower() if path else ""
+    if ext == ".npy":
+        return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=tuple(shape))
+    if ext in (".pgm", ".ppm"):
+        magic = b"P5" if len(shape) == 2 else b"P6"
+        header = magic + f"\n{shape[1]} {shape[0]}\n255\n".encode()
+        with open(path, "wb") as f:
+            f.write(header)
+            f.truncate(len(header) + int(np.prod(shape)))
+        return np.memmap(path, dtype=np.uint8, mode="r+", offset=len(header), shape=tuple(shape))
+    return np.empty(shape, dtype=dtype)
+
+
+def _div255(x):
+    # exact round(x / 255) for 0 <= x <= 255 * 255, without an integer division
+    x += 128
+    x += x >> 8
+    x >>= 8
+    return x
+
+
+def blend_arrays(base, overlay, alpha=0.5, mask=None, out=None):
+    """
+    Integer blend of two uint8 arrays: base * (1 - a) + overlay * a.
+    mask is an optional uint8 per-pixel alpha (0-255) that replaces alpha.
+    """
+    for name, array in (("base", base), ("overlay", overlay), ("mask", mask)):
+        # 255 * 255 is the most the uint16 intermediates can hold
+        if array is not None and array.dtype != np.uint8:
+            raise ValueError(f"{name} must be 8-bit, got {array.dtype}")
+    base16 = base.astype(np.uint16)
+    overlay16 = overlay.astype(np.uint16)
+    if mask is None:
+        weight = np.uint16(round(alpha * 255))
+        inverse = np.uint16(255) - weight
+    else:
+        weight = mask.astype(np.uint16)
+        if weight.ndim < base16.ndim:
+            weight = weight[..., None]
+        inverse = np.uint16(255) - weight
+    base16 *= inverse
+    overlay16 *= weight
+    base16 += overlay16
+    result = _div255(base16)
+    if out is None:
+        return result.astype(np.uint8)
+    out[...] = result
+    return out
+
+
+def blend_tiled(base, overlay, out, alpha=0.5, mask=None, position=(0, 0), tile_rows=512):
+    """
+    Blends overlay onto base at position (x, y), tile_rows rows at a time, so
+    only one tile of each input is resident at once. Inputs may be memory maps.
+    """
+    height, width = base.shape[:2]
+    x, y = position
+    overlay_height, overlay_width = overlay.shape[:2]
+    left, right = max(0, x), min(width, x + overlay_width)
+    for top in range(0, height, tile_rows):
+        bottom = min(height, top + tile_rows)
+        if out is not base:
+            out[top:bottom] = base[top:bottom]
+        row_start, row_end = max(top, y), min(bottom, y + overlay_height)
+        if row_start >= row_end or left >= right:
+            continue
+        overlay_rows = slice(row_start - y, row_end - y)
+        overlay_cols = slice(left - x, right - x)
+        blend_arrays(
+            base[row_start:row_end, left:right],
+            overlay[overlay_rows, overlay_cols],
+            alpha,
+            None if mask is None else mask[overlay_rows, overlay_cols],
+            out=out[row_start:row_end, left:right],
+        )
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+
+def blend_job(job):
+    """
+    Runs one blend job described by a dict with keys base, overlay, output and
+    optionally alpha, mask, position, tile_rows and shape/overlay_shape/mask_shape
+    for raw inputs.
+    """
+    try:
+        base = open_raw(job["base"], job.get("shape"))
+        overlay = open_raw(job["overlay"], job.get("overlay_shape"))
+        mask = open_raw(job["mask"], job.get("mask_shape")) if job.get("mask") else None
+        out = create_output(job["output"], base.shape)
+        blend_tiled(base, overlay, out, job.get("alpha", 0.5), mask,
+                    tuple(job.get("position", (0, 0))), job.get("tile_rows", 512))
+        if not isinstance(out, np.memmap):
+            Image.fromarray(out).save(job["output"])
+        return f"Saved {job['output']}"
+    except Exception as e:
+        return f"Error blending {job.get('base')}: {e}"
+
+
+def blend_batch(jobs, max_workers=None):
+    """
+    Runs many blend jobs across a process pool.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(blend_job, jobs))
+
+
+if __name__ == "__main__":
+    jobs = [
+        {
+            "base": r"C:\Users\MuraliDharan S\OneDrive\Desktop\scans\scan_0001.ppm",
+            "overlay": r"C:\Users\MuraliDharan S\OneDrive\Desktop\scans\watermark.ppm",
+            "mask": r"C:\Users\MuraliDharan S\OneDrive\Desktop\scans\watermark_alpha.pgm",
+            "position": (1000, 1000),
+            "output": "scan_0001_watermarked.ppm",
+        },
+    ]
+
+    starttime = time.time()
+    results = blend_batch(jobs)
+    print("\n".join(results))
+    print(f"\nTotal execution time: {time.time() - starttime:.2f} seconds")
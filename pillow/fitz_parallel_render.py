@@ -0,0 +1,146 @@
+import fitz  # PyMuPDF
+import numpy as np
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# Per-worker state, set once by the pool initializer
+_doc = None
+_shm = None
+_slot_size = 0
+
+
+def _init_worker(pdf_path, shm_name, slot_size):
+    global _doc, _shm, _slot_size
+    _doc = fitz.open(pdf_path)
+    _slot_size = slot_size
+    if shm_name:
+        _shm = shared_memory.SharedMemory(name=shm_name)
+
+
+def _render(page_number, zoom, gray):
+    page = _doc[page_number - 1]
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False,
+                          colorspace=fitz.csGRAY if gray else fitz.csRGB)
+    shape = (pix.height, pix.width) if gray else (pix.height, pix.width, pix.n)
+    # a view of the pixmap's own samples, no copy
+    return pix, np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(shape)
+
+
+def _render_into_slot(page_number, slot, zoom, gray):
+    pix, array = _render(page_number, zoom, gray)
+    target = np.ndarray(array.shape, dtype=np.uint8, buffer=_shm.buf, offset=slot * _slot_size)
+    target[...] = array
+    shape = array.shape
+    del target, array, pix
+    return page_number, slot, shape
+
+
+def _render_and_process(page_number, zoom, gray, process_fn):
+    pix, array = _render(page_number, zoom, gray)
+    try:
+        return process_fn(page_number, array)
+    except Exception as e:
+        return f"Error processing page {page_number}: {e}"
+
+
+def _page_shapes(pdf_path, pages, zoom, gray):
+    shapes = {}
+    with fitz.open(pdf_path) as doc:
+        for page_number in pages:
+            irect = (doc[page_number - 1].rect * fitz.Matrix(zoom, zoom)).irect
+            shapes[page_number] = (irect.height, irect.width) if gray else (irect.height, irect.width, 3)
+    return shapes
+
+
+def iter_pages(pdf_path, dpi=150, pages=None, processes=None, gray=False, slots=None):
+    """
+    Renders pages across a process pool in which every worker opens the
+    document once and keeps it open. Yields (page_number, array) in page order.
+
+    Workers write each page straight into one slot of a preallocated shared
+    memory pool and the parent yields a NumPy view of that slot, so a page is
+    copied once (pixmap to slot) and never pickled. A slot is reused as soon as
+    the consumer moves on, so copy an array that must outlive its iteration.
+    """
+    processes = processes or os.cpu_count()
+    slots = slots or 2 * processes
+    zoom = dpi / 72
+    if pages is None:
+        with fitz.open(pdf_path) as doc:
+            pages = range(1, doc.page_count + 1)
+    pages = list(pages)
+    shapes = _page_shapes(pdf_path, pages, zoom, gray)
+    # one extra row/column of headroom for rounding differences in the rendered size
+    slot_size = max((shape[0] + 1) * (shape[1] + 1) * (1 if gray else 3) for shape in shapes.values())
+    shm = shared_memory.SharedMemory(create=True, size=slot_size * slots)
+    try:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(pdf_path, shm.name, slot_size)) as executor:
+            free_slots = deque(range(slots))
+            remaining = iter(pages)
+            pending = deque()
+
+            def fill():
+                while free_slots:
+                    page_number = next(remaining, None)
+                    if page_number is None:
+                        return
+                    pending.append(executor.submit(_render_into_slot, page_number, free_slots.popleft(), zoom, gray))
+
+            fill()
+            while pending:
+                page_number, slot, shape = pending.popleft().result()
+                view = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=slot * slot_size)
+                yield page_number, view
+                del view
+                free_slots.append(slot)
+                fill()
+    finally:
+        try:
+            shm.close()
+        except BufferError:
+            # the caller kept a view; the block is freed when that view is released
+            pass
+        shm.unlink()
+
+
+def process_pages(pdf_path, process_fn, dpi=150, pages=None, processes=None, gray=False):
+    """
+    Renders and processes pages entirely inside the workers: process_fn(page_number, array)
+    gets a zero-copy view of the pixmap, and only its (small) return values come back.
+    """
+    processes = processes or os.cpu_count()
+    if pages is None:
+        with fitz.open(pdf_path) as doc:
+            pages = range(1, doc.page_count + 1)
+    pages = list(pages)
+    zoom = dpi / 72
+    chunksize = max(1, len(pages) // (processes * 4))
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                             initargs=(pdf_path, None, 0)) as executor:
+        return list(executor.map(_render_and_process, pages, [zoom] * len(pages), [gray] * len(pages),
+                                 [process_fn] * len(pages), chunksize=chunksize))
+
+
+def save_page(page_number, array):
+    from PIL import Image
+
+    output_file = f"page_{page_number}_fitz.jpg"
+    Image.fromarray(array).save(output_file)
+    return f"Saved {output_file}"
+
+
+if __name__ == "__main__":
+    pdf_path = r"C:\Users\MuraliDharan S\OneDrive\Desktop\Iterations-codility.pdf"
+
+    starttime = time.time()
+    for page_number, array in iter_pages(pdf_path, dpi=150):
+        print(f"Page {page_number}: {array.shape}, mean {array.mean():.1f}")
+    print(f"\nShared-memory render: {time.time() - starttime:.2f} seconds")
+
+    starttime = time.time()
+    print("\n".join(process_pages(pdf_path, save_page, dpi=150)))
+    print(f"\nRender + save in workers: {time.time() - starttime:.2f} seconds")
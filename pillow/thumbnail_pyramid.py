@@ -0,0 +1,113 @@
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import os
+import time
+
+DEFAULT_SIZES = (1024, 512, 256, 128)
+
+
+def _fit(width, height, max_edge):
+    scale = min(1.0, max_edge / max(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def decode_for_size(img, max_edge, reducing_gap=2.0):
+    """
+    Decodes the image at the smallest scale that is still at least
+    reducing_gap times the requested size. JPEGs are scaled in the DCT domain
+    with draft(); other formats fall back to an integer reduce() after decode.
+    """
+    target = _fit(img.width, img.height, max_edge * reducing_gap)
+    if img.format == "JPEG":
+        img.draft("RGB", target)
+    img = img.convert("RGB")
+    factor = int(min(img.width / target[0], img.height / target[1]))
+    if factor >= 2:
+        img = img.reduce(factor)
+    return img
+
+
+def make_pyramid(path, sizes=DEFAULT_SIZES, resample=Image.LANCZOS, reducing_gap=2.0):
+    """
+    Produces thumbnails for every max-edge size in sizes from a single decode.
+    Each level is downscaled from the previous one, largest first.
+    """
+    sizes = sorted(sizes, reverse=True)
+    with Image.open(path) as img:
+        original_size = img.size
+        current = decode_for_size(img, sizes[0], reducing_gap)
+    pyramid = {}
+    for size in sizes:
+        target = _fit(*original_size, size)
+        if current.size != target:
+            current = current.resize(target, resample=resample)
+        pyramid[size] = current
+    return pyramid
+
+
+def compare_with_direct(path, sizes=DEFAULT_SIZES, resample=Image.LANCZOS):
+    """
+    Compares the pyramid against a full decode resized directly to each size.
+    Returns {size: (mean_abs_diff, max_abs_diff)} on the 0-255 scale.
+    """
+    pyramid = make_pyramid(path, sizes, resample)
+    with Image.open(path) as img:
+        full = img.convert("RGB")
+    differences = {}
+    for size, thumb in pyramid.items():
+        direct = np.asarray(full.resize(thumb.size, resample=resample), dtype=np.int16)
+        diff = np.abs(np.asarray(thumb, dtype=np.int16) - direct)
+        differences[size] = (float(diff.mean()), int(diff.max()))
+    return differences
+
+
+def matches_direct(path, sizes=DEFAULT_SIZES, mean_tolerance=2.0):
+    """
+    True if every pyramid level is within mean_tolerance of a direct LANCZOS resize.
+    """
+    return all(mean <= mean_tolerance for mean, _ in compare_with_direct(path, sizes).values())
+
+
+def save_pyramid(args):
+    path, output_dir, sizes, quality = args
+    try:
+        name = os.path.splitext(os.path.basename(path))[0]
+        saved = []
+        for size, thumb in make_pyramid(path, sizes).items():
+            output_file = os.path.join(output_dir, f"{name}_{size}.jpg")
+            thumb.save(output_file, "JPEG", quality=quality)
+            saved.append(output_file)
+        return f"Saved {', '.join(saved)}"
+    except Exception as e:
+        return f"Error processing {path}: {e}"
+
+
+def generate_thumbnails(paths, output_dir, sizes=DEFAULT_SIZES, quality=85, max_workers=None, chunksize=8):
+    """
+    Builds thumbnail pyramids for many images across a process pool.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    args = [(path, output_dir, tuple(sizes), quality) for path in paths]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(save_pyramid, args, chunksize=chunksize))
+
+
+if __name__ == "__main__":
+    image_path = r"C:\Users\MuraliDharan S\OneDrive\Desktop\HTML-CSS BEG\images\shinchan.jpg"
+
+    starttime = time.time()
+    pyramid = make_pyramid(image_path)
+    print(f"Pyramid from one decode: {time.time() - starttime:.3f} seconds")
+    for size, thumb in pyramid.items():
+        print(size, thumb.size)
+
+    starttime = time.time()
+    with Image.open(image_path) as img:
+        full = img.convert("RGB")
+        for size in DEFAULT_SIZES:
+            full.resize(_fit(full.width, full.height, size), resample=Image.LANCZOS)
+    print(f"Full decode + direct LANCZOS: {time.time() - starttime:.3f} seconds")
+
+    for size, (mean, worst) in compare_with_direct(image_path).items():
+        print(f"{size}: mean abs diff {mean:.2f}, max abs diff {worst}")
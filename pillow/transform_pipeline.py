@@ -0,0 +1,252 @@
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+import os
+import time
+
+RESAMPLE_FILTERS = {
+    "nearest": Image.NEAREST,
+    "box": Image.BOX,
+    "bilinear": Image.BILINEAR,
+    "hamming": Image.HAMMING,
+    "bicubic": Image.BICUBIC,
+    "lanczos": Image.LANCZOS,
+}
+
+# rotate(angle, expand=True) by a multiple of 90 degrees, or by 180 with or without expand, is a lossless transpose
+TRANSPOSE_FOR_ANGLE = {
+    90: Image.ROTATE_90,
+    180: Image.ROTATE_180,
+    270: Image.ROTATE_270,
+}
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff")
+
+
+def _inside(box, outer):
+    # a crop box that stays within the previous crop; one that reaches past it must pad, not read the source
+    width, height = outer[2] - outer[0], outer[3] - outer[1]
+    return 0 <= box[0] <= box[2] <= width and 0 <= box[1] <= box[3] <= height
+
+
+def _is_transpose(step):
+    # quarter turns are lossless only with expand; without it they crop the corners of non-square images
+    angle = step["angle"] % 360
+    return angle % 90 == 0 and (step.get("expand", True) or angle % 180 == 0)
+
+
+def _rotate_options(step):
+    return step.get("fillcolor", "white"), step.get("resample", "bicubic").lower()
+
+
+def fuse_spec(spec):
+    """
+    Rewrites a list of transform steps into an equivalent, cheaper list:
+    crop+crop (when the second box lies inside the first) becomes one crop,
+    crop+resize becomes resize(box=...) (checked against the image bounds when
+    applied) and consecutive lossless rotations are merged into a single
+    rotate or transpose.
+    """
+    fused = []
+    for step in spec:
+        step = dict(step)
+        previous = fused[-1] if fused else None
+        if (previous is not None and previous["op"] == "crop" and step["op"] == "crop"
+                and _inside(step["box"], previous["box"])):
+            left, upper = previous["box"][0], previous["box"][1]
+            box = step["box"]
+            previous["box"] = (left + box[0], upper + box[1], left + box[2], upper + box[3])
+            continue
+        if previous is not None and previous["op"] == "crop" and step["op"] == "resize" and "box" not in step:
+            # applied as resize(box=...) when the box lies inside the image, else as the crop it was
+            step["crop"] = tuple(previous["box"])
+            fused[-1] = step
+            continue
+        if (previous is not None and previous["op"] == "rotate" and step["op"] == "rotate"
+                and _is_transpose(previous) and _is_transpose(step)
+                and _rotate_options(previous) == _rotate_options(step)):
+            previous["angle"] = (previous["angle"] + step["angle"]) % 360
+            # a 180 degree turn never changes the size, so the sum needs expand only if a quarter turn did
+            previous["expand"] = previous.get("expand", True) or step.get("expand", True)
+            continue
+        fused.append(step)
+    return [step for step in fused if not (step["op"] == "rotate" and step["angle"] % 360 == 0)]
+
+
+def _load_overlay(step):
+    if "image" in step:
+        with Image.open(step["image"]) as overlay:
+            overlay.load()
+            return overlay
+    return Image.new("RGBA", (1, 1), step.get("color", "white"))
+
+
+def compile_spec(spec):
+    """
+    Fuses the spec and resolves everything that does not depend on the input
+    image (resample filters, overlay images) so it is done once per worker.
+    """
+    ops = []
+    for step in fuse_spec(spec):
+        op = step["op"]
+        if op == "crop":
+            ops.append(("crop", tuple(step["box"])))
+        elif op == "resize":
+            resample = RESAMPLE_FILTERS[step.get("resample", "lanczos").lower()]
+            ops.append(("resize", {
+                "size": step.get("size"),
+                "scale": step.get("scale"),
+                "box": step.get("box"),
+                "crop": step.get("crop"),
+                "resample": resample,
+                "reducing_gap": step.get("reducing_gap"),
+            }))
+        elif op == "rotate":
+            angle = step["angle"] % 360
+            expand = step.get("expand", True)
+            if angle in TRANSPOSE_FOR_ANGLE and (expand or angle == 180):
+                ops.append(("transpose", TRANSPOSE_FOR_ANGLE[angle]))
+            else:
+                ops.append(("rotate", {
+                    "angle": angle,
+                    "expand": expand,
+                    "fillcolor": step.get("fillcolor", "white"),
+                    "resample": RESAMPLE_FILTERS[step.get("resample", "bicubic").lower()],
+                }))
+        elif op in ("blend", "overlay"):
+            ops.append((op, {
+                "image": _load_overlay(step),
+                "alpha": step.get("alpha", 0.5),
+                "position": tuple(step.get("position", (0, 0))),
+                "cache": {},
+            }))
+        else:
+            raise ValueError(f"Unknown transform op: {op}")
+    return ops
+
+
+def _resize(img, params):
+    box = params["box"]
+    crop = params["crop"]
+    if crop is not None:
+        if 0 <= crop[0] <= crop[2] <= img.width and 0 <= crop[1] <= crop[3] <= img.height:
+            box = crop
+        else:
+            # the crop reaches past the image and has to pad, which resize(box=...) cannot do
+            img = img.crop(crop)
+    box = box or (0, 0, img.width, img.height)
+    size = params["size"]
+    if size is None:
+        scale = params["scale"] or 1.0
+        size = (max(1, round((box[2] - box[0]) * scale)), max(1, round((box[3] - box[1]) * scale)))
+    return img.resize(tuple(size), resample=params["resample"], box=box, reducing_gap=params["reducing_gap"])
+
+
+def _overlay_for(params, size, mode):
+    # Overlays are rescaled once per (size, mode) and reused for every image of that shape
+    key = (size, mode)
+    if key not in params["cache"]:
+        params["cache"][key] = params["image"].convert(mode).resize(size, Image.BILINEAR)
+    return params["cache"][key]
+
+
+def apply_ops(img, ops):
+    """
+    Applies compiled ops to a single PIL image and returns the result.
+    """
+    for op, params in ops:
+        if op == "crop":
+            img = img.crop(params)
+        elif op == "resize":
+            img = _resize(img, params)
+        elif op == "transpose":
+            img = img.transpose(params)
+        elif op == "rotate":
+            img = img.rotate(**params)
+        elif op == "blend":
+            if img.mode not in ("RGB", "RGBA", "L"):
+                img = img.convert("RGB")
+            img = Image.blend(img, _overlay_for(params, img.size, img.mode), params["alpha"])
+        elif op == "overlay":
+            overlay = params["image"]
+            if overlay.mode != "RGBA":
+                overlay = overlay.convert("RGBA")
+            if params["alpha"] < 1.0:
+                key = ("faded", params["alpha"])
+                if key not in params["cache"]:
+                    faded = overlay.copy()
+                    faded.putalpha(faded.getchannel("A").point(lambda a: int(a * params["alpha"])))
+                    params["cache"][key] = faded
+                overlay = params["cache"][key]
+            base = img.convert("RGBA")
+            base.alpha_composite(overlay, dest=params["position"])
+            img = base if img.mode == "RGBA" else base.convert(img.mode if img.mode != "P" else "RGB")
+    return img
+
+
+_worker_ops = None
+
+
+def _init_worker(spec):
+    global _worker_ops
+    _worker_ops = compile_spec(spec)
+
+
+def _output_path(input_path, output_dir, output_format):
+    name, ext = os.path.splitext(os.path.basename(input_path))
+    if output_format:
+        ext = "." + output_format.lower().replace("jpeg", "jpg")
+    return os.path.join(output_dir, name + ext)
+
+
+def _process_file(args):
+    input_path, output_dir, output_format, save_kwargs = args
+    output_file = _output_path(input_path, output_dir, output_format)
+    try:
+        with Image.open(input_path) as img:
+            result = apply_ops(img, _worker_ops)
+            if output_file.lower().endswith((".jpg", ".jpeg")) and result.mode not in ("RGB", "L"):
+                result = result.convert("RGB")
+            result.save(output_file, **save_kwargs)
+        return f"Saved {output_file}"
+    except Exception as e:
+        return f"Error processing {input_path}: {e}"
+
+
+def process_stream(paths, spec, output_dir, output_format=None, max_workers=None, chunksize=16, **save_kwargs):
+    """
+    Applies the spec to an iterable of image paths across a process pool and
+    yields one result string per image, in input order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    args = ((path, output_dir, output_format, save_kwargs) for path in paths)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(spec,)) as executor:
+        yield from executor.map(_process_file, args, chunksize=chunksize)
+
+
+def process_directory(input_dir, output_dir, spec, output_format=None, max_workers=None, chunksize=16, **save_kwargs):
+    """
+    Applies the spec to every image in input_dir and writes the results to output_dir.
+    """
+    paths = sorted(
+        os.path.join(input_dir, name) for name in os.listdir(input_dir)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    return list(process_stream(paths, spec, output_dir, output_format, max_workers, chunksize, **save_kwargs))
+
+
+if __name__ == "__main__":
+    input_dir = r"C:\Users\MuraliDharan S\OneDrive\Desktop\HTML-CSS BEG\images"
+    output_dir = "thumbnails"
+    spec = [
+        {"op": "crop", "box": (30, 30, 430, 430)},  # folded into resize(box=...)
+        {"op": "resize", "size": (200, 200), "resample": "lanczos"},
+        {"op": "rotate", "angle": 90, "expand": True},  # done as a transpose
+        {"op": "blend", "color": "red", "alpha": 0.2},
+    ]
+
+    starttime = time.time()
+    results = process_directory(input_dir, output_dir, spec, output_format="JPEG", quality=85)
+    print("\n".join(results))
+    endtime = time.time()
+    print(f"\nTotal execution time: {endtime - starttime:.2f} seconds")
+    print(f"Images per second: {len(results) / (endtime - starttime):.1f}")
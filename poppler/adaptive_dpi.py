@@ -0,0 +1,95 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+import fitz  # PyMuPDF
+from pdf2image import convert_from_path
+
+# x-height of a typical Latin font as a fraction of its point size
+X_HEIGHT_RATIO = 0.5
+
+
+def inspect_page(page):
+    """
+    Collects what decides a page's render resolution without rendering it:
+    the smallest font size in the text layer, the highest native resolution
+    of the embedded images and the page size in points.
+    """
+    font_sizes = [
+        span["size"]
+        for block in page.get_text("dict")["blocks"] if block["type"] == 0
+        for line in block["lines"]
+        for span in line["spans"] if span["text"].strip()
+    ]
+    image_ppi = 0.0
+    for image in page.get_images(full=True):
+        xref, width, height = image[0], image[2], image[3]
+        for rect in page.get_image_rects(xref):
+            if rect.width > 0 and rect.height > 0:
+                image_ppi = max(image_ppi, width / (rect.width / 72), height / (rect.height / 72))
+    return {
+        "min_font_size": min(font_sizes) if font_sizes else None,
+        "image_ppi": image_ppi,
+        "width": page.rect.width,
+        "height": page.rect.height,
+    }
+
+
+def choose_dpi(info, target_x_height=20, min_dpi=100, max_dpi=500, step=25, max_pixels=120_000_000):
+    """
+    Picks the lowest dpi that gives the smallest text target_x_height pixels of
+    x-height and does not undersample embedded images, clamped to
+    [min_dpi, max_dpi], rounded up to a multiple of step and capped so the page
+    stays under max_pixels.
+    """
+    dpi = min_dpi
+    if info["min_font_size"]:
+        dpi = max(dpi, target_x_height * 72 / (info["min_font_size"] * X_HEIGHT_RATIO))
+    dpi = max(dpi, info["image_ppi"])
+    dpi = min(max_dpi, math.ceil(dpi / step) * step)
+    pixel_cap = math.sqrt(max_pixels / (info["width"] * info["height"] / 72 ** 2))
+    return int(max(min_dpi, min(dpi, pixel_cap // step * step)))
+
+
+def plan_dpi(pdf_path, first_page=None, last_page=None, **choose_kwargs):
+    """
+    Returns {page_number: (dpi, info)} for the requested pages.
+    """
+    plan = {}
+    with fitz.open(pdf_path) as doc:
+        for page_number in range(first_page or 1, (last_page or doc.page_count) + 1):
+            info = inspect_page(doc[page_number - 1])
+            plan[page_number] = (choose_dpi(info, **choose_kwargs), info)
+    return plan
+
+
+def render_page(pdf_path, page_number, dpi, poppler_path=None):
+    return convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number,
+                             poppler_path=poppler_path)[0]
+
+
+def convert_adaptive(pdf_path, poppler_path=None, first_page=None, last_page=None, max_workers=None,
+                     **choose_kwargs):
+    """
+    Renders every page at its own adaptive dpi. Returns a list of
+    (page_number, dpi, image) so the chosen resolution travels with the page.
+    """
+    plan = plan_dpi(pdf_path, first_page, last_page, **choose_kwargs)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            page_number: executor.submit(render_page, pdf_path, page_number, dpi, poppler_path)
+            for page_number, (dpi, _) in plan.items()
+        }
+        return [(page_number, plan[page_number][0], future.result()) for page_number, future in futures.items()]
+
+
+if __name__ == "__main__":
+    pdf_path = "OCR_extraction.pdf"
+    poppler_path = r"D:\Program Files\poppler-24.08.0\Library\bin"
+
+    for page_number, (dpi, info) in plan_dpi(pdf_path).items():
+        print(f"Page {page_number}: {dpi} dpi (smallest font {info['min_font_size']}, image ppi {info['image_ppi']:.0f})")
+
+    starttime = time.time()
+    for page_number, dpi, image in convert_adaptive(pdf_path, poppler_path=poppler_path):
+        image.save(f"page_{page_number}.png", "PNG", dpi=(dpi, dpi))
+    print(f"\nTotal execution time: {time.time() - starttime:.2f} seconds")
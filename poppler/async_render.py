@@ -0,0 +1,141 @@
+import asyncio
+import os
+import tempfile
+import time
+from collections import deque
+from io import BytesIO
+from PIL import Image
+from tiled_render import pdftoppm_command, pnm_to_array, poppler_binary
+
+
+async def page_count_async(pdf_path, poppler_path=None):
+    """
+    Reads the page count with pdfinfo without blocking the event loop.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        poppler_binary("pdfinfo", poppler_path), pdf_path,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"pdfinfo failed: {stderr.decode(errors='replace').strip()}")
+    for line in stdout.decode(errors="replace").splitlines():
+        key, _, value = line.partition(":")
+        if key.strip() == "Pages":
+            return int(value)
+    raise ValueError(f"Could not read the page count of {pdf_path}")
+
+
+async def render_page_async(pdf_path, page_number, dpi=200, poppler_path=None, gray=False, region=None,
+                            timeout=None):
+    """
+    Renders one page with pdftoppm as an asyncio subprocess and returns it as a
+    uint8 array. The subprocess is killed if the call is cancelled or times out.
+    """
+    cmd = pdftoppm_command(pdf_path, page_number, dpi, poppler_path, region, gray)
+    proc = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    if proc.returncode != 0:
+        raise RuntimeError(f"pdftoppm failed on page {page_number}: {stderr.decode(errors='replace').strip()}")
+    return pnm_to_array(stdout)
+
+
+async def _spool(pdf_data):
+    # pdftoppm and pdfinfo need a seekable file; write bytes input to a temporary one off the loop
+    def write():
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+            f.write(pdf_data)
+            return f.name
+
+    return await asyncio.get_running_loop().run_in_executor(None, write)
+
+
+async def render_async(doc, first_page=None, last_page=None, dpi=200, poppler_path=None, gray=False,
+                       concurrency=2, prefetch=4, transform=None, executor=None, timeout=None):
+    """
+    Async generator yielding (page_number, result) in page order.
+
+    doc is a path or the PDF bytes. At most concurrency pdftoppm processes run
+    at once and at most prefetch pages are rendered ahead of the consumer, so a
+    slow consumer applies backpressure instead of buffering the whole document.
+    transform (e.g. a resize or encode) runs in executor, off the event loop.
+    Closing or cancelling the generator kills the renders still in flight.
+    """
+    loop = asyncio.get_running_loop()
+    spooled = None
+    if isinstance(doc, (bytes, bytearray, memoryview)):
+        doc = spooled = await _spool(bytes(doc))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def render(page_number):
+        async with semaphore:
+            array = await render_page_async(doc, page_number, dpi, poppler_path, gray, timeout=timeout)
+        if transform is None:
+            return array
+        return await loop.run_in_executor(executor, transform, array)
+
+    pending = deque()
+    try:
+        last_page = last_page or await page_count_async(doc, poppler_path)
+        pages = iter(range(first_page or 1, last_page + 1))
+        for page_number in pages:
+            pending.append((page_number, asyncio.ensure_future(render(page_number))))
+            if len(pending) >= prefetch:
+                break
+        while pending:
+            page_number, task = pending.popleft()
+            result = await task
+            for next_page in pages:
+                pending.append((next_page, asyncio.ensure_future(render(next_page))))
+                break
+            yield page_number, result
+    finally:
+        for _, task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+        if spooled:
+            os.remove(spooled)
+
+
+def encode_image(array, fmt="PNG", **save_kwargs):
+    """
+    Encodes a uint8 array to bytes; meant to run in an executor.
+    """
+    buffer = BytesIO()
+    Image.fromarray(array).save(buffer, format=fmt, **save_kwargs)
+    return buffer.getvalue()
+
+
+async def save_async(array, output_file, fmt="PNG", executor=None, **save_kwargs):
+    """
+    Encodes and writes an image in an executor so the event loop keeps serving other requests.
+    """
+    def save():
+        Image.fromarray(array).save(output_file, format=fmt, **save_kwargs)
+        return f"Saved {output_file}"
+
+    return await asyncio.get_running_loop().run_in_executor(executor, save)
+
+
+if __name__ == "__main__":
+    pdf_path = "OCR_extraction.pdf"
+    poppler_path = r"D:\Program Files\poppler-24.08.0\Library\bin"
+
+    async def main():
+        starttime = time.time()
+        os.makedirs("output", exist_ok=True)
+        saves = []
+        async for page_number, array in render_async(pdf_path, dpi=300, poppler_path=poppler_path):
+            print(f"Page {page_number} ready after {time.time() - starttime:.2f} seconds")
+            saves.append(asyncio.ensure_future(save_async(array, os.path.join("output", f"page_{page_number}.png"))))
+        print("\n".join(await asyncio.gather(*saves)))
+        print(f"\nTotal execution time: {time.time() - starttime:.2f} seconds")
+
+    asyncio.run(main())
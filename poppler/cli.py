@@ -0,0 +1,189 @@
+"""
+Command line entry point: python cli.py {render,extract-text,ner,bench} ...
+
+Only the standard library is imported at startup. Each subcommand imports the
+backends it needs (pdf2image, PyMuPDF, transformers, ...) when it runs, and
+process pools use a fork server that preloads those imports once, so workers
+start warm instead of re-importing them.
+"""
+import argparse
+import os
+import sys
+import time
+
+POPPLER_PATH = os.environ.get("POPPLER_PATH")
+
+
+def process_pool(max_workers, preload=()):
+    """
+    A ProcessPoolExecutor whose workers fork from a server that has already
+    imported preload. Falls back to spawn where fork servers are unavailable.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(list(preload))
+    else:
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+
+def _render_one(pdf_path, page_number, dpi, output_dir, fmt, poppler_path, gray, timeout):
+    from PIL import Image
+    from tiled_render import render_page
+
+    try:
+        array = render_page(pdf_path, page_number, dpi, poppler_path, gray, timeout)
+        ext = "jpg" if fmt == "JPEG" else fmt.lower()
+        output_file = os.path.join(output_dir, f"page_{page_number}.{ext}")
+        Image.fromarray(array).save(output_file, fmt)
+        return f"Saved {output_file} ({dpi} dpi)"
+    except Exception as e:
+        return f"Error processing page {page_number}: {e}"
+
+
+def cmd_render(args):
+    from pdf2image import pdfinfo_from_path
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    first_page = args.first_page or 1
+    last_page = args.last_page or pdfinfo_from_path(args.pdf, poppler_path=args.poppler_path)["Pages"]
+    pages = range(first_page, last_page + 1)
+    if args.adaptive:
+        from adaptive_dpi import plan_dpi
+
+        plan = plan_dpi(args.pdf, first_page, last_page, max_dpi=args.dpi)
+        dpis = [plan[page_number][0] for page_number in pages]
+    else:
+        dpis = [args.dpi] * len(pages)
+    with process_pool(args.workers, preload=["numpy", "PIL.Image", "tiled_render"]) as executor:
+        futures = [
+            executor.submit(_render_one, args.pdf, page_number, dpi, args.output_dir, args.format.upper(),
+                            args.poppler_path, args.gray, args.timeout)
+            for page_number, dpi in zip(pages, dpis)
+        ]
+        for future in futures:
+            print(future.result())
+
+
+def cmd_extract_text(args):
+    import fitz  # PyMuPDF
+
+    with fitz.open(args.pdf) as doc:
+        last_page = args.last_page or doc.page_count
+        chunks = [doc[page_number - 1].get_text() for page_number in range(args.first_page or 1, last_page + 1)]
+    text = "\f".join(chunks)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"Saved {args.output}")
+    else:
+        sys.stdout.write(text)
+
+
+ENTITY_MAPPING = {"PER": "per", "LOC": "loc", "ORG": "org", "MISC": "misc"}
+
+
+def ner_chunks(texts, tokenizer, max_tokens=None):
+    """
+    Splits texts (one per page) into chunks that fit the model's input window,
+    breaking only between words, so no text is truncated away.
+    """
+    max_tokens = max_tokens or min(tokenizer.model_max_length, 512) - tokenizer.num_special_tokens_to_add()
+    for text in texts:
+        chunk, length = [], 0
+        for word in text.split():
+            word_length = len(tokenizer.tokenize(word))
+            if chunk and length + word_length > max_tokens:
+                yield " ".join(chunk)
+                chunk, length = [], 0
+            chunk.append(word)
+            length += word_length
+        if chunk:
+            yield " ".join(chunk)
+
+
+def cmd_ner(args):
+    if args.pdf:
+        import fitz  # PyMuPDF
+
+        with fitz.open(args.pdf) as doc:
+            texts = [page.get_text() for page in doc]
+    else:
+        texts = [args.text]
+    import torch
+    from transformers import pipeline
+
+    device = 0 if torch.cuda.is_available() else -1
+    ner_pipeline = pipeline("ner", model=args.model, device=device)
+    chunks = list(ner_chunks(texts, ner_pipeline.tokenizer))
+    entity_dict = {}
+    for entities in ner_pipeline(chunks, batch_size=args.batch_size):
+        for entity in entities:
+            entity_type = ENTITY_MAPPING.get(entity["entity"].split("-")[-1], entity["entity"])
+            entity_dict.setdefault(entity_type, []).append(entity["word"])
+    print(entity_dict)
+
+
+def cmd_bench(args):
+    from concurrency_autotune import host_profile, load_or_tune
+
+    config = load_or_tune(args.pdf, dpi=args.dpi, poppler_path=args.poppler_path, fmt=args.format.upper(),
+                          retune=args.retune)
+    print(f"Configuration for {host_profile()}: {config}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="PDF rendering and processing tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    render = subparsers.add_parser("render", help="render PDF pages to image files")
+    render.add_argument("pdf")
+    render.add_argument("--dpi", type=int, default=300, help="render dpi (upper bound with --adaptive)")
+    render.add_argument("--adaptive", action="store_true", help="choose the dpi per page from its content")
+    render.add_argument("--first-page", type=int)
+    render.add_argument("--last-page", type=int)
+    render.add_argument("--format", default="PNG", choices=["PNG", "JPEG", "png", "jpeg"])
+    render.add_argument("--gray", action="store_true")
+    render.add_argument("--output-dir", default="output")
+    render.add_argument("--workers", type=int, default=None)
+    render.add_argument("--timeout", type=float, default=None, help="per-page render timeout in seconds")
+    render.add_argument("--poppler-path", default=POPPLER_PATH)
+    render.set_defaults(func=cmd_render)
+
+    extract = subparsers.add_parser("extract-text", help="extract the text layer with PyMuPDF")
+    extract.add_argument("pdf")
+    extract.add_argument("--first-page", type=int)
+    extract.add_argument("--last-page", type=int)
+    extract.add_argument("--output", help="write to a file instead of stdout")
+    extract.set_defaults(func=cmd_extract_text)
+
+    ner = subparsers.add_parser("ner", help="named entity recognition with multilingual BERT")
+    source = ner.add_mutually_exclusive_group(required=True)
+    source.add_argument("--text")
+    source.add_argument("--pdf")
+    ner.add_argument("--model", default="bert-base-multilingual-cased")
+    ner.add_argument("--batch-size", type=int, default=8, help="text chunks per model call")
+    ner.set_defaults(func=cmd_ner)
+
+    bench = subparsers.add_parser("bench", help="tune worker/thread/batch settings for this host")
+    bench.add_argument("pdf")
+    bench.add_argument("--dpi", type=int, default=300)
+    bench.add_argument("--format", default="PNG")
+    bench.add_argument("--retune", action="store_true", help="ignore the saved configuration")
+    bench.add_argument("--poppler-path", default=POPPLER_PATH)
+    bench.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    starttime = time.time()
+    args.func(args)
+    print(f"\nTotal execution time: {time.time() - starttime:.2f} seconds", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import json
+import os
+import platform
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+CACHE_FILE = os.environ.get(
+    "IMAGE_PROCESSING_AUTOTUNE_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "image_processing", "autotune.json"),
+)
+
+
+def host_profile():
+    """
+    Identifies the kind of host, not the host itself, so identical machines share a tuned configuration.
+    """
+    return f"{platform.system()}-{platform.machine()}-{os.cpu_count()}cpu"
+
+
+def render_batch(pdf_path, first_page, last_page, dpi, thread_count, poppler_path, fmt="PNG"):
+    """
+    The probed unit of work: render a page range and encode every page.
+    """
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=first_page, last_page=last_page,
+                               thread_count=thread_count, poppler_path=poppler_path)
+    sizes = []
+    for image in images:
+        buffer = BytesIO()
+        image.save(buffer, format=fmt)
+        sizes.append(buffer.tell())
+    return len(sizes)
+
+
+def _run_group(batches, threads, pdf_path, dpi, thread_count, poppler_path, fmt):
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return sum(executor.map(
+            lambda batch: render_batch(pdf_path, batch[0], batch[1], dpi, thread_count, poppler_path, fmt),
+            batches,
+        ))
+
+
+def _warm(_):
+    return os.getpid()
+
+
+def run_with_config(pdf_path, pages, config, dpi=300, poppler_path=None, fmt="PNG"):
+    """
+    Runs the workload over pages with one configuration: pages are cut into
+    batches of config["batch_size"] and spread over config["processes"]
+    processes, each working through its batches with config["threads"] threads.
+    Returns the number of pages processed.
+    """
+    pages = list(pages)
+    batch_size = config["batch_size"]
+    batches = [(pages[i], pages[min(i + batch_size, len(pages)) - 1]) for i in range(0, len(pages), batch_size)]
+    groups = [batches[i::config["processes"]] for i in range(config["processes"])]
+    groups = [group for group in groups if group]
+    with ProcessPoolExecutor(max_workers=config["processes"]) as executor:
+        list(executor.map(_warm, range(config["processes"])))
+        return sum(executor.map(
+            _run_group, groups,
+            [config["threads"]] * len(groups), [pdf_path] * len(groups), [dpi] * len(groups),
+            [config["thread_count"]] * len(groups), [poppler_path] * len(groups), [fmt] * len(groups),
+        ))
+
+
+def measure(pdf_path, pages, config, dpi=300, poppler_path=None, fmt="PNG"):
+    start = time.perf_counter()
+    done = run_with_config(pdf_path, pages, config, dpi, poppler_path, fmt)
+    return done / (time.perf_counter() - start)
+
+
+def _powers_of_two(limit):
+    value = 1
+    while value <= limit:
+        yield value
+        value *= 2
+
+
+def worker_layouts(cpus, threads=(1, 2, 4), thread_counts=(1, 2, 4)):
+    """
+    The (processes, threads, thread_count) layouts worth probing: those that
+    use more than half of the CPUs without oversubscribing them. Besides
+    powers of two, the process count that fills the host is always included,
+    so hosts like 12 or 48 CPUs can be used completely.
+    """
+    layouts = []
+    for thread in threads:
+        for thread_count in thread_counts:
+            fill = cpus // (thread * thread_count)
+            for processes in sorted(set(_powers_of_two(cpus)) | {fill}):
+                if processes >= 1 and cpus / 2 < processes * thread * thread_count <= cpus:
+                    layouts.append((processes, thread, thread_count))
+    return sorted(layouts) or [(1, 1, 1)]
+
+
+def autotune(pdf_path, dpi=300, sample_pages=None, poppler_path=None, fmt="PNG", max_cpus=None, verbose=True):
+    """
+    Probes throughput (pages per second) on a sample of the document. Every
+    process / threads per process / pdftoppm thread_count layout from
+    worker_layouts is measured, then the batch size is tuned for the fastest.
+    Returns (best_config, pages_per_second).
+    """
+    cpus = max_cpus or os.cpu_count()
+    if sample_pages is None:
+        total_pages = pdfinfo_from_path(pdf_path, poppler_path=poppler_path)["Pages"]
+        sample_pages = range(1, min(total_pages, max(2 * cpus, 8)) + 1)
+    sample_pages = list(sample_pages)
+    best, best_rate = None, 0.0
+    tried = set()
+
+    def probe(config):
+        nonlocal best, best_rate
+        key = tuple(sorted(config.items()))
+        if key in tried:
+            return
+        tried.add(key)
+        rate = measure(pdf_path, sample_pages, config, dpi, poppler_path, fmt)
+        if verbose:
+            print(f"{config}: {rate:.2f} pages/s")
+        if best is None or rate > best_rate:
+            best, best_rate = config, rate
+
+    for processes, threads, thread_count in worker_layouts(cpus):
+        probe({"processes": processes, "threads": threads, "thread_count": thread_count, "batch_size": 2})
+    for batch_size in (1, 2, 4, 8):
+        probe(dict(best, batch_size=batch_size))
+    return best, best_rate
+
+
+def load_cache(cache_file=CACHE_FILE):
+    if not os.path.exists(cache_file):
+        return {}
+    with open(cache_file) as f:
+        return json.load(f)
+
+
+def save_config(key, config, rate, cache_file=CACHE_FILE):
+    cache = load_cache(cache_file)
+    cache[key] = {"config": config, "pages_per_second": rate, "tuned_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    with open(cache_file, "w") as f:
+        json.dump(cache, f, indent=2)
+
+
+def load_or_tune(pdf_path, dpi=300, poppler_path=None, fmt="PNG", retune=False, cache_file=CACHE_FILE):
+    """
+    Returns the saved configuration for this host profile and workload, tuning
+    on pdf_path and saving the result first if there is none (or retune=True).
+    """
+    key = f"{host_profile()}|dpi={dpi}|{fmt}"
+    cached = load_cache(cache_file).get(key)
+    if cached and not retune:
+        return cached["config"]
+    config, rate = autotune(pdf_path, dpi, poppler_path=poppler_path, fmt=fmt)
+    save_config(key, config, rate, cache_file)
+    return config
+
+
+if __name__ == "__main__":
+    pdf_path = "OCR_extraction.pdf"
+    poppler_path = r"D:\Program Files\poppler-24.08.0\Library\bin"
+
+    starttime = time.time()
+    config = load_or_tune(pdf_path, dpi=300, poppler_path=poppler_path)
+    print(f"Configuration for {host_profile()}: {config}")
+    print(f"Tuning/lookup time: {time.time() - starttime:.2f} seconds")
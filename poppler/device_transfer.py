@@ -0,0 +1,265 @@
+import contextlib
+import time
+import numpy as np
+
+
+class NumpyBackend:
+    """
+    Host-only backend with the same interface as TorchBackend: "device"
+    buffers are ordinary arrays and copies complete immediately. Used on
+    machines without an accelerator, and as the stub device in CPU-only runs.
+    """
+
+    name = "cpu"
+
+    def host_buffer(self, shape, dtype=np.uint8):
+        return np.empty(shape, dtype=dtype)
+
+    def device_buffer(self, shape, dtype=np.uint8):
+        return np.empty(shape, dtype=dtype)
+
+    def as_host(self, array):
+        return array
+
+    def stream(self):
+        return None
+
+    def use_stream(self, stream):
+        return contextlib.nullcontext()
+
+    def copy(self, dst, src):
+        np.copyto(dst, src)
+
+    def record(self, stream=None):
+        return None
+
+    def wait(self, stream, event):
+        pass
+
+    def synchronize(self, event):
+        pass
+
+
+class TorchBackend:
+    """
+    PyTorch backend. On CUDA, host buffers are pinned, copies are
+    non-blocking and uploads, compute and downloads run on separate streams
+    ordered by events. On a CPU device it degrades to plain synchronous copies.
+    """
+
+    def __init__(self, device="cuda"):
+        import torch
+
+        self.torch = torch
+        self.device = torch.device(device if device != "cuda" or torch.cuda.is_available() else "cpu")
+        self.cuda = self.device.type == "cuda"
+        self.name = str(self.device)
+
+    def host_buffer(self, shape, dtype=np.uint8):
+        return self.torch.empty(shape, dtype=self.torch.uint8, pin_memory=self.cuda)
+
+    def device_buffer(self, shape, dtype=np.uint8):
+        return self.torch.empty(shape, dtype=self.torch.uint8, device=self.device)
+
+    def as_host(self, array):
+        return self.torch.from_numpy(np.ascontiguousarray(array))
+
+    def stream(self):
+        return self.torch.cuda.Stream() if self.cuda else None
+
+    def use_stream(self, stream):
+        return self.torch.cuda.stream(stream) if stream is not None else contextlib.nullcontext()
+
+    def copy(self, dst, src):
+        dst.copy_(src, non_blocking=self.cuda)
+
+    def record(self, stream=None):
+        if not self.cuda:
+            return None
+        event = self.torch.cuda.Event()
+        event.record(stream)
+        return event
+
+    def wait(self, stream, event):
+        if event is not None:
+            (stream or self.torch.cuda.current_stream()).wait_event(event)
+
+    def synchronize(self, event):
+        if event is not None:
+            event.synchronize()
+
+
+class TransferManager:
+    """
+    Moves batches of uint8 pages to the device, runs a compute function on
+    them and brings the results back, double-buffered: while batch i is
+    uploaded and computed, batch i - 1 is downloaded and delivered.
+
+    All buffers (pinned host staging for inputs and outputs, device input and
+    output arenas) are allocated once for num_slots batches of page_shape and
+    reused, so there is no per-batch allocation, synchronize() or empty_cache().
+    Pages of other sizes are batched separately, in order, as views into the
+    same arenas; a page larger than page_shape grows them once.
+    compute_fn(device_in, device_out) gets (n, H, W[, C]) views with the real
+    page shape and must write its result into device_out, which has out_shape
+    (or the page shape when out_shape is None).
+    """
+
+    def __init__(self, batch_size, page_shape, out_shape=None, backend=None, num_slots=2):
+        self.backend = backend or NumpyBackend()
+        self.batch_size = batch_size
+        self.page_shape = tuple(page_shape)
+        self.out_shape = tuple(out_shape) if out_shape else None
+        self.num_slots = num_slots
+        self.downloaded = [None] * num_slots
+        self._allocate(int(np.prod(self.page_shape)), int(np.prod(self.out_shape or self.page_shape)))
+        b = self.backend
+        self.upload_stream, self.compute_stream, self.download_stream = b.stream(), b.stream(), b.stream()
+
+    def _allocate(self, page_size, out_size):
+        b = self.backend
+        self.page_size, self.out_size = page_size, out_size
+        in_shape, result_shape = (self.batch_size * page_size,), (self.batch_size * out_size,)
+        self.host_in = [b.host_buffer(in_shape) for _ in range(self.num_slots)]
+        self.host_out = [b.host_buffer(result_shape) for _ in range(self.num_slots)]
+        self.device_in = [b.device_buffer(in_shape) for _ in range(self.num_slots)]
+        self.device_out = [b.device_buffer(result_shape) for _ in range(self.num_slots)]
+
+    def _fit(self, shape, out_shape):
+        page_size, out_size = int(np.prod(shape)), int(np.prod(out_shape))
+        if page_size <= self.page_size and out_size <= self.out_size:
+            return
+        # a larger page than planned for: wait for every slot, then grow the arenas once
+        for event in self.downloaded:
+            self.backend.synchronize(event)
+        self.downloaded = [None] * self.num_slots
+        self._allocate(max(page_size, self.page_size), max(out_size, self.out_size))
+
+    @staticmethod
+    def _view(buffer, n, shape):
+        return buffer[:n * int(np.prod(shape))].reshape((n,) + shape)
+
+    def _stage(self, slot, pages, shape):
+        host = self._view(self.host_in[slot], len(pages), shape)
+        for i, page in enumerate(pages):
+            self.backend.copy(host[i], self.backend.as_host(page))
+        return host
+
+    def _submit(self, slot, pages, compute_fn):
+        b = self.backend
+        n = len(pages)
+        shape = tuple(pages[0].shape)
+        out_shape = self.out_shape or shape
+        # the slot's host buffers are free again only once its previous download finished
+        b.synchronize(self.downloaded[slot])
+        host_in = self._stage(slot, pages, shape)
+        device_in = self._view(self.device_in[slot], n, shape)
+        device_out = self._view(self.device_out[slot], n, out_shape)
+        host_out = self._view(self.host_out[slot], n, out_shape)
+        with b.use_stream(self.upload_stream):
+            b.copy(device_in, host_in)
+            uploaded = b.record(self.upload_stream)
+        with b.use_stream(self.compute_stream):
+            b.wait(self.compute_stream, uploaded)
+            compute_fn(device_in, device_out)
+            computed = b.record(self.compute_stream)
+        with b.use_stream(self.download_stream):
+            b.wait(self.download_stream, computed)
+            b.copy(host_out, device_out)
+            self.downloaded[slot] = b.record(self.download_stream)
+        return host_out
+
+    def _collect(self, slot, keys, results):
+        self.backend.synchronize(self.downloaded[slot])
+        return [(key, results[i]) for i, key in enumerate(keys)]
+
+    def run(self, pages, compute_fn):
+        """
+        Processes an iterable of (key, page) pairs and yields (key, result) in
+        order. A batch holds pages of one shape; a page of another shape
+        starts a new batch. A result is a view into a reused staging buffer,
+        valid until the next batch is yielded; copy it (or encode it) before moving on.
+        """
+        batch = []
+        in_flight = None
+        slot = 0
+
+        def flush():
+            nonlocal in_flight, slot
+            shape = tuple(batch[0][1].shape)
+            self._fit(shape, self.out_shape or shape)
+            results = self._submit(slot, [page for _, page in batch], compute_fn)
+            done = self._collect(*in_flight) if in_flight is not None else []
+            in_flight = (slot, [key for key, _ in batch], results)
+            slot = (slot + 1) % self.num_slots
+            batch.clear()
+            return done
+
+        for key, page in pages:
+            if batch and tuple(page.shape) != tuple(batch[0][1].shape):
+                yield from flush()
+            batch.append((key, page))
+            if len(batch) == self.batch_size:
+                yield from flush()
+        if batch:
+            yield from flush()
+        if in_flight is not None:
+            yield from self._collect(*in_flight)
+
+
+def torch_resize_compute(size):
+    """
+    compute_fn for TorchBackend: bilinear resize of an (N, H, W, C) uint8
+    batch to size=(height, width) with rounding and saturation back to uint8.
+    """
+    import torch
+
+    def compute(device_in, device_out):
+        batch = device_in.permute(0, 3, 1, 2).float()
+        resized = torch.nn.functional.interpolate(batch, size=size, mode="bilinear", align_corners=False)
+        device_out.copy_(resized.round_().clamp_(0, 255).permute(0, 2, 3, 1))
+
+    return compute
+
+
+def numpy_resize_compute(size):
+    """
+    compute_fn for NumpyBackend using the integer-domain resize from int_transforms.
+    """
+    from int_transforms import resize_bilinear_u8
+
+    height, width = size
+
+    def compute(device_in, device_out):
+        for page, out in zip(device_in, device_out):
+            resize_bilinear_u8(page, (width, height), out=out)
+
+    return compute
+
+
+if __name__ == "__main__":
+    from pdf2image import convert_from_path
+    from PIL import Image
+
+    pdf_path = "OCR_extraction.pdf"
+    poppler_path = r"D:\Program Files\poppler-24.08.0\Library\bin"
+    images = convert_from_path(pdf_path, dpi=150, poppler_path=poppler_path)
+    pages = [(page_number, np.asarray(image)) for page_number, image in enumerate(images, start=1)]
+    # the arenas are sized for the largest page; smaller or rotated pages are batched by shape
+    page_shape = max((page.shape for _, page in pages), key=np.prod)
+
+    try:
+        backend = TorchBackend("cuda")
+        compute = torch_resize_compute((1080, 1920))
+    except ImportError:
+        backend = NumpyBackend()
+        compute = numpy_resize_compute((1080, 1920))
+    print(f"Using {backend.name} backend")
+
+    starttime = time.time()
+    manager = TransferManager(batch_size=4, page_shape=page_shape, out_shape=(1080, 1920, 3), backend=backend)
+    for page_number, result in manager.run(pages, compute):
+        output = result.numpy() if hasattr(result, "numpy") else result
+        Image.fromarray(output).save(f"page_{page_number}_gpu.jpg")
+        print(f"Saved page_{page_number}_gpu.jpg")
+    print(f"\nTotal execution time: {time.time() - starttime:.2f} seconds")
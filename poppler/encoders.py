@@ -0,0 +1,138 @@
+import time
+from io import BytesIO
+import numpy as np
+from PIL import Image
+
+EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "TIFF": "tif"}
+
+# Each setting is the format plus the keyword arguments PIL's save() understands for it
+CANDIDATES = [
+    {"format": "JPEG", "quality": 85, "subsampling": 2},
+    {"format": "JPEG", "quality": 90, "subsampling": 0},
+    {"format": "JPEG", "quality": 85, "optimize": True, "progressive": True},
+    {"format": "PNG", "compress_level": 1},
+    {"format": "PNG", "compress_level": 3},
+    {"format": "PNG", "compress_level": 6},
+    {"format": "WEBP", "quality": 80, "method": 0},
+    {"format": "WEBP", "quality": 90, "method": 4},
+    {"format": "WEBP", "lossless": True, "method": 0},
+    {"format": "TIFF", "compression": "tiff_lzw"},
+    {"format": "TIFF", "compression": "tiff_adobe_deflate"},
+]
+
+
+def describe(setting):
+    params = ", ".join(f"{key}={value}" for key, value in setting.items() if key != "format")
+    return f"{setting['format']}({params})"
+
+
+def _prepare(image, setting):
+    if setting["format"] == "JPEG" and image.mode not in ("RGB", "L", "CMYK"):
+        return image.convert("RGB")
+    return image
+
+
+def encode(image, setting):
+    """
+    Encodes a PIL image with one encoder setting and returns the bytes.
+    """
+    params = {key: value for key, value in setting.items() if key != "format"}
+    buffer = BytesIO()
+    _prepare(image, setting).save(buffer, format=setting["format"], **params)
+    return buffer.getvalue()
+
+
+def save_image(image, output_stem, setting):
+    """
+    Saves image as output_stem plus the extension of the setting's format.
+    """
+    output_file = f"{output_stem}.{EXTENSIONS[setting['format']]}"
+    params = {key: value for key, value in setting.items() if key != "format"}
+    _prepare(image, setting).save(output_file, format=setting["format"], **params)
+    return output_file
+
+
+def _box_mean(x, size):
+    # mean over size x size windows ("valid" region) from a summed-area table
+    s = np.pad(x, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+    return (s[size:, size:] - s[:-size, size:] - s[size:, :-size] + s[:-size, :-size]) / (size * size)
+
+
+def ssim(a, b, size=7):
+    """
+    Mean structural similarity of two images on their luma channel, with a
+    uniform size x size window.
+    """
+    x = np.asarray(a.convert("L"), dtype=np.float64)
+    y = np.asarray(b.convert("L"), dtype=np.float64)
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    mx, my = _box_mean(x, size), _box_mean(y, size)
+    vx = _box_mean(x * x, size) - mx * mx
+    vy = _box_mean(y * y, size) - my * my
+    cov = _box_mean(x * y, size) - mx * my
+    s = ((2 * mx * my + c1) * (2 * cov + c2)) / ((mx * mx + my * my + c1) * (vx + vy + c2))
+    return float(s.mean())
+
+
+def benchmark(samples, setting, repeats=1):
+    """
+    Encodes every sample page with one setting, after one untimed warm-up
+    encode. Returns mean seconds per page, mean bytes per page and the worst
+    SSIM against the original.
+    """
+    seconds = 0.0
+    sizes = []
+    worst = 1.0
+    # one discarded encode, so one-time codec setup is not charged to whichever setting runs first
+    encode(samples[0], setting)
+    for image in samples:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            data = encode(image, setting)
+        seconds += (time.perf_counter() - start) / repeats
+        sizes.append(len(data))
+        lossless = setting["format"] in ("PNG", "TIFF") or setting.get("lossless")
+        if not lossless:
+            with Image.open(BytesIO(data)) as decoded:
+                worst = min(worst, ssim(_prepare(image, setting), decoded))
+    return {
+        "setting": setting,
+        "seconds": seconds / len(samples),
+        "bytes": sum(sizes) / len(sizes),
+        "ssim": worst,
+    }
+
+
+def autotune(samples, candidates=CANDIDATES, max_bytes=None, min_ssim=None, repeats=1):
+    """
+    Benchmarks candidate settings on sample pages and returns (best, report):
+    the fastest setting whose mean size is at most max_bytes and whose worst
+    SSIM is at least min_ssim. If nothing qualifies, the best is the candidate
+    that comes closest (highest SSIM, then smallest size).
+    """
+    report = [benchmark(samples, setting, repeats) for setting in candidates]
+    qualifying = [
+        result for result in report
+        if (max_bytes is None or result["bytes"] <= max_bytes)
+        and (min_ssim is None or result["ssim"] >= min_ssim)
+    ]
+    if qualifying:
+        best = min(qualifying, key=lambda result: result["seconds"])
+    else:
+        best = max(report, key=lambda result: (result["ssim"], -result["bytes"]))
+    return best["setting"], report
+
+
+if __name__ == "__main__":
+    from pdf2image import convert_from_path
+
+    pdf_path = "OCR_extraction.pdf"
+    poppler_path = r"D:\Program Files\poppler-24.08.0\Library\bin"
+    samples = convert_from_path(pdf_path, dpi=300, first_page=1, last_page=2, poppler_path=poppler_path)
+
+    best, report = autotune(samples, max_bytes=1_000_000, min_ssim=0.97)
+    for result in sorted(report, key=lambda result: result["seconds"]):
+        print(f"{describe(result['setting']):60} {result['seconds'] * 1000:8.1f} ms "
+              f"{result['bytes'] / 1024:8.0f} KiB  SSIM {result['ssim']:.4f}")
+    print(f"\nSelected: {describe(best)}")
+    print(save_image(samples[0], "page_1", best))
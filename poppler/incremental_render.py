@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+import fitz  # PyMuPDF
+from pdf2image import convert_from_path
+
+MANIFEST = "manifest.json"
+REFERENCE = re.compile(rb"(\d+) (\d+) R")
+# back links to the page or a parent field would pull the whole page tree into every annotation's hash
+BACK_LINK = re.compile(rb"/(?:P|Parent)\s*\d+ \d+ R")
+# how a stream is stored; the decoded data is hashed instead, so recompressing a file changes nothing
+STREAM_ENCODING = re.compile(rb"/(?:Length|Filter|DecodeParms)\s*(?:\d+ \d+ R|\d+|/\w+|\[[^\]]*\]|<<.*?>>)")
+# page keys that change what the page looks like (pdftoppm draws annotation appearances); the rest is ignored
+PAGE_KEYS = ("Contents", "Resources", "MediaBox", "CropBox", "Rotate", "Annots")
+INHERITABLE = ("Resources", "MediaBox", "CropBox", "Rotate")
+
+
+def _digest_value(doc, value, memo, stack):
+    # replace every "n g R" with the digest of the object it points at, so renumbered objects still match
+    def resolve(match):
+        return _object_digest(doc, int(match.group(1)), memo, stack)
+
+    return REFERENCE.sub(resolve, BACK_LINK.sub(b"", value.encode()))
+
+
+def _stream_data(doc, xref):
+    try:
+        return doc.xref_stream(xref) or b""
+    except Exception:
+        # a filter MuPDF cannot decode; fall back to the stored bytes
+        return doc.xref_stream_raw(xref) or b""
+
+
+def _object_digest(doc, xref, memo, stack):
+    if xref in memo:
+        return memo[xref]
+    if xref in stack or xref <= 0 or xref >= doc.xref_length():
+        return b"<cycle>"
+    stack.add(xref)
+    value = doc.xref_object(xref, compressed=True)
+    is_stream = doc.xref_is_stream(xref)
+    if is_stream:
+        value = STREAM_ENCODING.sub(b"", value.encode()).decode(errors="replace")
+    h = hashlib.sha1(_digest_value(doc, value, memo, stack))
+    if is_stream:
+        h.update(_stream_data(doc, xref))
+    stack.discard(xref)
+    memo[xref] = h.hexdigest().encode()
+    return memo[xref]
+
+
+def _page_key(doc, page_xref, key):
+    # follow /Parent for inheritable attributes, as a renderer would
+    xref = page_xref
+    while True:
+        kind, value = doc.xref_get_key(xref, key)
+        if kind != "null" or key not in INHERITABLE:
+            return kind, value
+        kind, parent = doc.xref_get_key(xref, "Parent")
+        if kind != "xref":
+            return "null", "null"
+        xref = int(parent.split()[0])
+
+
+def page_fingerprints(pdf_path):
+    """
+    Fingerprints every page from the PDF structure alone, without rendering:
+    a hash of its decoded content streams, resources (fonts, images, forms,
+    resolved recursively), boxes and annotations with their appearance
+    streams. Objects shared between pages are hashed once.
+    """
+    fingerprints = []
+    memo = {}
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            h = hashlib.sha1()
+            for key in PAGE_KEYS:
+                kind, value = _page_key(doc, page.xref, key)
+                h.update(f"/{key} {kind} ".encode())
+                h.update(_digest_value(doc, value, memo, set()))
+            fingerprints.append(h.hexdigest())
+    return fingerprints
+
+
+def load_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _link_or_copy(source, target):
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _render_page(pdf_path, page_number, dpi, fmt, output_file, poppler_path):
+    image = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number,
+                              poppler_path=poppler_path)[0]
+    image.save(output_file, fmt)
+
+
+def incremental_render(pdf_path, output_dir, previous_dir=None, dpi=300, fmt="PNG", poppler_path=None,
+                       max_workers=None):
+    """
+    Renders a new revision of a document, re-rendering only pages whose
+    fingerprint is not found in the previous revision's manifest. Unchanged
+    pages (even if they moved) are hard-linked from the previous output.
+    previous_dir defaults to output_dir, which is then updated in place.
+
+    Only files listed in output_dir's manifest are replaced or removed; a page
+    file that would overwrite anything else raises FileExistsError.
+    """
+    previous_dir = previous_dir or output_dir
+    previous = load_manifest(previous_dir)
+    reusable = {}
+    if previous and previous["dpi"] == dpi and previous["format"] == fmt:
+        for entry in previous["pages"]:
+            reusable.setdefault(entry["fingerprint"], os.path.join(previous_dir, entry["output"]))
+
+    fingerprints = page_fingerprints(pdf_path)
+    ext = "jpg" if fmt.upper() == "JPEG" else fmt.lower()
+    names = [f"page_{page_number}.{ext}" for page_number in range(1, len(fingerprints) + 1)]
+    os.makedirs(output_dir, exist_ok=True)
+    current = load_manifest(output_dir)
+    owned = {entry["output"] for entry in current["pages"]} if current else set()
+    foreign = [name for name in names if name not in owned and os.path.exists(os.path.join(output_dir, name))]
+    if foreign:
+        raise FileExistsError(f"{output_dir} has files not written by incremental_render: {', '.join(foreign)}")
+
+    # stage every page before touching output_dir, so reused pages are linked before their source is replaced
+    staging = tempfile.mkdtemp(prefix=".incremental-", dir=output_dir)
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for page_number, (name, fingerprint) in enumerate(zip(names, fingerprints), start=1):
+                target = os.path.join(staging, name)
+                if fingerprint in reusable and os.path.exists(reusable[fingerprint]):
+                    _link_or_copy(reusable[fingerprint], target)
+                    status = "reused"
+                else:
+                    futures.append(executor.submit(_render_page, pdf_path, page_number, dpi, fmt, target,
+                                                   poppler_path))
+                    status = "rendered"
+                results.append({"page": page_number, "status": status, "fingerprint": fingerprint, "output": name})
+            for future in futures:
+                future.result()
+
+        with open(os.path.join(staging, MANIFEST), "w") as f:
+            json.dump({"dpi": dpi, "format": fmt, "source": os.path.abspath(pdf_path), "pages": results}, f,
+                      indent=2)
+        for name in names:
+            os.replace(os.path.join(staging, name), os.path.join(output_dir, name))
+        # pages the previous revision had and this one does not
+        for name in owned - set(names):
+            path = os.path.join(output_dir, name)
+            if os.path.exists(path):
+                os.remove(path)
+        os.replace(os.path.join(staging, MANIFEST), os.path.join(output_dir, MANIFEST))
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    pdf_path = "OCR_extraction.pdf"
+    poppler_path = r"D:\Program Files\poppler-24.08.0\Library\bin"
+
+    starttime = time.time()
+    results = incremental_render(pdf_path, "output_incremental", dpi=300, poppler_path=poppler_path)
+    rendered = [result["page"] for result in results if result["status"] == "rendered"]
+    print(f"Re-rendered pages: {rendered or 'none'} of {len(results)}")
+    print(f"Total execution time: {time.time() - starttime:.2f} seconds")
@@ -0,0 +1,171 @@
+import time
+import numpy as np
+
+# Resize weights are Q8 fixed point: 256 == 1.0
+WEIGHT_BITS = 8
+WEIGHT_ONE = 1 << WEIGHT_BITS
+
+
+def _xp(array):
+    """
+    Returns the array module (numpy or cupy) an array belongs to, so the same
+    transforms run on CPU arrays and CuPy GPU arrays without importing cupy.
+    """
+    if type(array).__module__.startswith("cupy"):
+        import cupy as cp
+
+        return cp
+    return np
+
+
+def _bilinear_taps(src_len, dst_len, xp):
+    # half-pixel centres, the same sampling as interpolate(mode="bilinear", align_corners=False)
+    scale = src_len / dst_len
+    pos = (np.arange(dst_len) + 0.5) * scale - 0.5
+    pos = np.clip(pos, 0, src_len - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, src_len - 1)
+    frac = np.rint((pos - lo) * WEIGHT_ONE).astype(np.uint32)
+    return xp.asarray(lo), xp.asarray(hi), xp.asarray(frac)
+
+
+def resize_bilinear_u8(img, size, out=None, rows_per_chunk=256):
+    """
+    Bilinear resize of a (H, W) or (H, W, C) uint8 image to size=(width, height)
+    in Q8 fixed point. Work is done rows_per_chunk output rows at a time, so the
+    only wide intermediate is one uint32 chunk, never a float copy of the page.
+    """
+    xp = _xp(img)
+    width, height = size
+    src_height, src_width = img.shape[:2]
+    if out is None:
+        out = xp.empty((height, width) + img.shape[2:], dtype=xp.uint8)
+    y0, y1, fy = _bilinear_taps(src_height, height, xp)
+    x0, x1, fx = _bilinear_taps(src_width, width, xp)
+    extra = (1,) * (img.ndim - 2)
+    fx = fx.reshape((1, width) + extra)
+    for top in range(0, height, rows_per_chunk):
+        rows = slice(top, min(height, top + rows_per_chunk))
+        wy = fy[rows].reshape((-1, 1) + extra)
+        # vertical pass: <= 255 * 256, fits in uint32 comfortably
+        vertical = img[y0[rows]].astype(xp.uint32) * (WEIGHT_ONE - wy) + img[y1[rows]].astype(xp.uint32) * wy
+        # horizontal pass: <= 255 * 256 * 256, still fits in uint32
+        blended = vertical[:, x0] * (WEIGHT_ONE - fx) + vertical[:, x1] * fx
+        blended += 1 << (2 * WEIGHT_BITS - 1)
+        blended >>= 2 * WEIGHT_BITS
+        out[rows] = blended
+    return out
+
+
+def reduce_u8(img, factor):
+    """
+    Box-filter downscale by an integer factor, summing in uint16/uint32.
+    """
+    xp = _xp(img)
+    height, width = img.shape[0] // factor * factor, img.shape[1] // factor * factor
+    blocks = img[:height, :width].reshape((height // factor, factor, width // factor, factor) + img.shape[2:])
+    acc_dtype = xp.uint16 if factor * factor <= 257 else xp.uint32
+    total = blocks.sum(axis=(1, 3), dtype=acc_dtype)
+    return ((total + factor * factor // 2) // (factor * factor)).astype(xp.uint8)
+
+
+def invert_u8(img, out=None):
+    """
+    255 - x, in place when out is img.
+    """
+    return _xp(img).invert(img, out=out)
+
+
+def _per_channel(value, channels):
+    value = np.asarray(value, dtype=np.float64).reshape(-1)
+    return np.broadcast_to(value, (channels,)) if value.size == 1 else value
+
+
+def normalize_lut(mean, std, channels=1, out_low=-1.0, out_high=1.0):
+    """
+    Builds a (256, channels) uint8 lookup table for (x / 255 - mean) / std with
+    the normalized range [out_low, out_high] stored as 0..255. Values outside
+    that range saturate instead of wrapping like (t * 255).byte() does.
+    """
+    mean, std = _per_channel(mean, channels), _per_channel(std, channels)
+    x = np.arange(256, dtype=np.float64)[:, None] / 255
+    normalized = (x - mean) / std
+    scaled = (normalized - out_low) / (out_high - out_low) * 255
+    return np.clip(np.rint(scaled), 0, 255).astype(np.uint8)
+
+
+def normalize_u8(img, mean=0.5, std=0.5, out=None, out_low=-1.0, out_high=1.0):
+    """
+    Normalizes a uint8 image without leaving uint8: one table lookup per pixel.
+    The result encodes [out_low, out_high] as 0..255; use to_normalized_float
+    or from_normalized_u8 when a consumer needs the actual float values.
+    """
+    xp = _xp(img)
+    channels = img.shape[2] if img.ndim == 3 else 1
+    lut = xp.asarray(normalize_lut(mean, std, channels, out_low, out_high))
+    if img.ndim == 2:
+        result = lut[:, 0][img]
+    else:
+        result = lut[img, xp.arange(channels)]
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+
+def from_normalized_u8(img, out_low=-1.0, out_high=1.0, dtype=np.float32):
+    """
+    Decodes the output of normalize_u8 back into normalized float values.
+    """
+    xp = _xp(img)
+    return img.astype(dtype) * xp.asarray((out_high - out_low) / 255, dtype=dtype) + xp.asarray(out_low, dtype=dtype)
+
+
+def _mean_std(img, mean, std, dtype):
+    xp = _xp(img)
+    channels = img.shape[2] if img.ndim == 3 else 1
+    mean = xp.asarray(_per_channel(mean, channels), dtype=dtype)
+    std = xp.asarray(_per_channel(std, channels), dtype=dtype)
+    return (mean, std) if img.ndim == 3 else (mean[0], std[0])
+
+
+def to_normalized_float(img, mean=0.0, std=1.0, channels_first=False, dtype=np.float32):
+    """
+    Explicit float export, (x / 255 - mean) / std, for consumers (models) that
+    need it. This is the only function here that allocates a float copy.
+    """
+    xp = _xp(img)
+    mean, std = _mean_std(img, mean, std, dtype)
+    result = img.astype(dtype)
+    result /= 255
+    result -= mean
+    result /= std
+    return xp.moveaxis(result, -1, 0) if channels_first and img.ndim == 3 else result
+
+
+def from_normalized_float(tensor, mean=0.0, std=1.0, channels_first=False):
+    """
+    Converts normalized floats back to uint8 with rounding and saturation.
+    With channels_first, tensor is (C, H, W) as exported by to_normalized_float
+    and the result is an (H, W, C) image again.
+    """
+    xp = _xp(tensor)
+    if channels_first and tensor.ndim == 3:
+        tensor = xp.moveaxis(tensor, 0, -1)
+    mean, std = _mean_std(tensor, mean, std, tensor.dtype)
+    return xp.clip(xp.rint((tensor * std + mean) * 255), 0, 255).astype(xp.uint8)
+
+
+if __name__ == "__main__":
+    from PIL import Image
+
+    page = np.asarray(Image.open("page_1.png").convert("RGB"))
+
+    starttime = time.time()
+    resized = resize_bilinear_u8(page, (1920, 1080))
+    normalized = normalize_u8(resized, mean=0.5, std=0.5)
+    print(f"uint8 resize + normalize: {time.time() - starttime:.3f} seconds")
+    Image.fromarray(normalized).save("page_1_processed.png")
+
+    inverted = invert_u8(page)
+    Image.fromarray(inverted).save("page_1_inverted.png")
@@ -8,16 +8,14 @@ import time
 from io import BytesIO
 from typing import List
 from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from async_render import render_async, encode_image
 
 async def convert_pdf_to_io_bytes(pdf_data: bytes) -> List[BytesIO]:
     try:
-        images = convert_from_bytes(pdf_data)
         buffers = []
-        for img in images:
-            buffer = BytesIO()
-            img.save(buffer, format="JPEG")
-            buffer.seek(0)
-            buffers.append(buffer)
+        async for _, jpeg_bytes in render_async(pdf_data, transform=partial(encode_image, fmt="JPEG")):
+            buffers.append(BytesIO(jpeg_bytes))
         return buffers
     except Exception as e:
         print(f"Error converting PDF to BytesIO: {e}")
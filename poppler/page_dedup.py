@@ -0,0 +1,147 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from pdf2image import convert_from_path
+from PIL import Image
+
+THUMB_SIZE = 512
+TILE = 16
+HASH_SIZE = 16
+
+
+def page_fingerprint(image):
+    """
+    Returns (thumbnail, dhash) for a rendered page: a grayscale thumbnail about
+    THUMB_SIZE pixels on the short side (box-reduced, so thin strokes keep their
+    contrast) and a HASH_SIZE * HASH_SIZE bit difference hash computed from it.
+    """
+    gray = image.convert("L")
+    factor = max(1, min(gray.width, gray.height) // THUMB_SIZE)
+    if factor > 1:
+        gray = gray.reduce(factor)
+    thumb = np.asarray(gray, dtype=np.int16)
+    small = np.asarray(gray.resize((HASH_SIZE + 1, HASH_SIZE), Image.BOX), dtype=np.int16)
+    dhash = np.packbits(small[:, 1:] > small[:, :-1])
+    return thumb, dhash
+
+
+def _tiles(array):
+    height, width = array.shape[0] // TILE * TILE, array.shape[1] // TILE * TILE
+    return array[:height, :width].reshape(height // TILE, TILE, width // TILE, TILE).swapaxes(1, 2)
+
+
+def is_blank(thumb, min_contrast=48):
+    """
+    A page is blank if no TILE x TILE tile of its thumbnail has a dark mark
+    against its surroundings: a single short line of text is enough to keep it.
+    """
+    tiles = _tiles(thumb)
+    contrast = tiles.max(axis=(2, 3)) - tiles.min(axis=(2, 3))
+    return int(contrast.max()) < min_contrast
+
+
+def hamming(a, b):
+    return int(np.unpackbits(np.bitwise_xor(a, b)).sum())
+
+
+def differing_tiles(a, b, max_pixel_diff=96):
+    """
+    Number of TILE x TILE tiles in which two same-sized thumbnails differ by
+    more than max_pixel_diff somewhere. Scan noise and sub-pixel shifts stay
+    well under the limit after the box reduction; a changed character does not.
+    """
+    return int((_tiles(np.abs(a - b)).max(axis=(2, 3)) > max_pixel_diff).sum())
+
+
+class PageDeduplicator:
+    """
+    Remembers the fingerprints of pages already written so near-duplicates
+    (re-scans, repeated pages) can point at the existing output. The dHash
+    only picks candidates; a match is confirmed tile by tile on the
+    thumbnails, so forms that differ in a single filled-in field are kept.
+    """
+
+    def __init__(self, min_contrast=48, max_hamming=10, max_pixel_diff=96, max_differing_tiles=0):
+        self.min_contrast = min_contrast
+        self.max_hamming = max_hamming
+        self.max_pixel_diff = max_pixel_diff
+        self.max_differing_tiles = max_differing_tiles
+        self.seen = []  # (dhash, thumb, page_number, output_file)
+
+    def classify(self, image):
+        """
+        Returns ("blank", None), ("duplicate", (page_number, output_file)) or
+        ("unique", (thumb, dhash)) for a rendered page.
+        """
+        thumb, dhash = page_fingerprint(image)
+        if is_blank(thumb, self.min_contrast):
+            return "blank", None
+        for seen_hash, seen_thumb, page_number, output_file in self.seen:
+            if (seen_thumb.shape == thumb.shape
+                    and hamming(dhash, seen_hash) <= self.max_hamming
+                    and differing_tiles(thumb, seen_thumb, self.max_pixel_diff) <= self.max_differing_tiles):
+                return "duplicate", (page_number, output_file)
+        return "unique", (thumb, dhash)
+
+    def register(self, fingerprint, page_number, output_file):
+        thumb, dhash = fingerprint
+        self.seen.append((dhash, thumb, page_number, output_file))
+
+
+def _save(image, output_file, fmt):
+    image.save(output_file, format=fmt)
+    return output_file
+
+
+def process_pages(images, output_dir="output", start_page=1, fmt="PNG", link_duplicates=False,
+                  deduplicator=None, max_workers=None):
+    """
+    Fingerprints each rendered page, skips blank pages, points duplicates at
+    the output already written and encodes only the unique pages (in parallel).
+    Returns one result dict per page with its decision.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    deduplicator = deduplicator or PageDeduplicator()
+    ext = "jpg" if fmt.upper() == "JPEG" else fmt.lower()
+    results = []
+    duplicates = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        for page_number, image in enumerate(images, start=start_page):
+            status, info = deduplicator.classify(image)
+            if status == "blank":
+                results.append({"page": page_number, "status": "blank", "output": None})
+            elif status == "duplicate":
+                result = {"page": page_number, "status": "duplicate", "duplicate_of": info[0], "output": info[1]}
+                results.append(result)
+                duplicates.append(result)
+            else:
+                output_file = os.path.join(output_dir, f"page_{page_number}.{ext}")
+                deduplicator.register(info, page_number, output_file)
+                futures.append(executor.submit(_save, image, output_file, fmt))
+                results.append({"page": page_number, "status": "saved", "output": output_file})
+        for future in futures:
+            future.result()
+    if link_duplicates:
+        for result in duplicates:
+            link_file = os.path.join(output_dir, f"page_{result['page']}.{ext}")
+            if os.path.exists(link_file):
+                os.remove(link_file)
+            os.link(result["output"], link_file)
+            result["output"] = link_file
+    return results
+
+
+if __name__ == "__main__":
+    pdf_path = "OCR_extraction.pdf"
+    poppler_path = r"D:\Program Files\poppler-24.08.0\Library\bin"
+
+    starttime = time.time()
+    images = convert_from_path(pdf_path, dpi=300, poppler_path=poppler_path)
+    results = process_pages(images, "output")
+    for result in results:
+        print(result)
+    skipped = sum(result["status"] != "saved" for result in results)
+    print(f"\nSkipped {skipped} of {len(results)} pages")
+    print(f"Total execution time: {time.time() - starttime:.2f} seconds")
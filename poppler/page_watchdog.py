@@ -0,0 +1,94 @@
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pdf2image import pdfinfo_from_path
+from PIL import Image
+from tiled_render import render_page
+
+
+def retry_dpis(dpi, retries=2, min_dpi=72):
+    """
+    The dpi ladder for one page: the requested dpi, then halved per retry, never below min_dpi.
+    """
+    dpis = [dpi]
+    for _ in range(retries):
+        dpis.append(max(min_dpi, dpis[-1] // 2))
+    return list(dict.fromkeys(dpis))
+
+
+def render_page_guarded(pdf_path, page_number, dpi=300, timeout=60, retries=2, poppler_path=None,
+                        gray=False, deadline=None):
+    """
+    Renders one page in its own pdftoppm process with a hard time limit. A
+    render that hangs or fails is killed and retried at a lower dpi; a page
+    that fails every attempt comes back quarantined instead of raising.
+    deadline is an absolute time.monotonic() value that no attempt may run past.
+    """
+    attempts = []
+    for attempt_dpi in retry_dpis(dpi, retries):
+        limit = timeout
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            limit = remaining if limit is None else min(limit, remaining)
+            if limit <= 0:
+                attempts.append((attempt_dpi, "job deadline reached"))
+                break
+        try:
+            image = render_page(pdf_path, page_number, attempt_dpi, poppler_path, gray, timeout=limit)
+            return {
+                "page": page_number,
+                "status": "ok" if not attempts else "retried",
+                "dpi": attempt_dpi,
+                "attempts": attempts,
+                "image": image,
+            }
+        except subprocess.TimeoutExpired:
+            attempts.append((attempt_dpi, f"timed out after {limit:.1f}s"))
+        except Exception as e:
+            attempts.append((attempt_dpi, str(e)))
+    return {"page": page_number, "status": "quarantined", "dpi": None, "attempts": attempts, "image": None}
+
+
+def render_job(pdf_path, dpi=300, first_page=None, last_page=None, timeout=60, retries=2, job_timeout=None,
+               poppler_path=None, gray=False, output_dir=None, max_workers=None):
+    """
+    Renders a document page by page with per-page timeouts, bounded retries and
+    an optional deadline for the whole job. Returns (results, quarantine) where
+    quarantine lists the pages that could not be rendered.
+    Pages are written to output_dir as they finish when it is given.
+    """
+    if last_page is None:
+        last_page = pdfinfo_from_path(pdf_path, poppler_path=poppler_path)["Pages"]
+    deadline = time.monotonic() + job_timeout if job_timeout else None
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    def run(page_number):
+        result = render_page_guarded(pdf_path, page_number, dpi, timeout, retries, poppler_path, gray, deadline)
+        if output_dir and result["image"] is not None:
+            result["output"] = os.path.join(output_dir, f"page_{page_number}.png")
+            Image.fromarray(result.pop("image")).save(result["output"], "PNG")
+        return result
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = [executor.submit(run, page_number) for page_number in range(first_page or 1, last_page + 1)]
+        for future in as_completed(futures):
+            results.append(future.result())
+    results.sort(key=lambda result: result["page"])
+    quarantine = [result["page"] for result in results if result["status"] == "quarantined"]
+    return results, quarantine
+
+
+if __name__ == "__main__":
+    pdf_path = "OCR_extraction.pdf"
+    poppler_path = r"D:\Program Files\poppler-24.08.0\Library\bin"
+
+    starttime = time.time()
+    results, quarantine = render_job(pdf_path, dpi=300, timeout=30, job_timeout=120,
+                                     poppler_path=poppler_path, output_dir="output")
+    for result in results:
+        print(f"Page {result['page']}: {result['status']} at {result['dpi']} dpi {result['attempts'] or ''}")
+    print(f"\nQuarantined pages: {quarantine}")
+    print(f"Total execution time: {time.time() - starttime:.2f} seconds")
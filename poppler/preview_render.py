@@ -0,0 +1,139 @@
+import itertools
+import os
+import threading
+import time
+from queue import PriorityQueue
+from pdf2image import pdfinfo_from_path
+from tiled_render import render_page
+
+# Lower tier runs first; explicit requests jump ahead of everything queued
+REQUESTED, PREVIEW_VISIBLE, PREVIEW, FULL_VISIBLE, FULL = range(5)
+
+
+class PreviewRenderer:
+    """
+    Two-phase, priority-aware renderer for interactive viewers: low-dpi
+    previews of the visible pages go out first, then the rest of the previews,
+    then full-resolution renders in the background. request_page() moves a
+    page to the front of the queue.
+
+    on_page(page_number, phase, array) is called from a worker thread as each
+    render completes; phase is "preview" or "full". An exception it raises is
+    recorded in errors under (page_number, f"{phase} callback").
+    """
+
+    def __init__(self, pdf_path, preview_dpi=36, full_dpi=300, poppler_path=None, on_page=None,
+                 max_workers=None, gray=False):
+        self.pdf_path = pdf_path
+        self.dpi = {"preview": preview_dpi, "full": full_dpi}
+        self.poppler_path = poppler_path
+        self.on_page = on_page
+        self.gray = gray
+        self.max_workers = max_workers or os.cpu_count()
+        self.total_pages = pdfinfo_from_path(pdf_path, poppler_path=poppler_path)["Pages"]
+        self.results = {}
+        self.errors = {}
+        self.queue = PriorityQueue()
+        self.order = itertools.count()
+        self.claimed = set()
+        self.condition = threading.Condition()
+        self.threads = []
+
+    def _put(self, tier, page_number, phase):
+        self.queue.put((tier, next(self.order), page_number, phase))
+
+    def start(self, visible_pages=()):
+        """
+        Queues every page in both phases, visible pages first, and starts the workers.
+        """
+        visible = [page for page in visible_pages if 1 <= page <= self.total_pages]
+        others = [page for page in range(1, self.total_pages + 1) if page not in visible]
+        for page_number in visible:
+            self._put(PREVIEW_VISIBLE, page_number, "preview")
+        for page_number in others:
+            self._put(PREVIEW, page_number, "preview")
+        for page_number in visible:
+            self._put(FULL_VISIBLE, page_number, "full")
+        for page_number in others:
+            self._put(FULL, page_number, "full")
+        for _ in range(self.max_workers):
+            thread = threading.Thread(target=self._worker, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def request_page(self, page_number, phase="full"):
+        """
+        Moves a page to the front of the queue. The entry it already had is
+        skipped when reached, so no page is rendered twice.
+        """
+        self._put(REQUESTED, page_number, phase)
+
+    def _worker(self):
+        while True:
+            tier, _, page_number, phase = self.queue.get()
+            if page_number is None:
+                return
+            key = (page_number, phase)
+            with self.condition:
+                if key in self.claimed:
+                    continue
+                self.claimed.add(key)
+            try:
+                array = render_page(self.pdf_path, page_number, self.dpi[phase], self.poppler_path, self.gray)
+            except Exception as e:
+                with self.condition:
+                    self.errors[key] = f"Error rendering page {page_number} ({phase}): {e}"
+                    self.condition.notify_all()
+                continue
+            with self.condition:
+                self.results[key] = array
+                self.condition.notify_all()
+            if self.on_page is not None:
+                try:
+                    self.on_page(page_number, phase, array)
+                except Exception as e:
+                    # the render itself succeeded, so get() still returns it; keep the worker alive
+                    with self.condition:
+                        self.errors[(page_number, f"{phase} callback")] = (
+                            f"Error in on_page for page {page_number} ({phase}): {e}")
+
+    def get(self, page_number, phase="full", timeout=None):
+        """
+        Returns the rendered page, requesting it first if it is not ready yet.
+        """
+        key = (page_number, phase)
+        with self.condition:
+            if key not in self.results and key not in self.errors:
+                self.request_page(page_number, phase)
+            if not self.condition.wait_for(lambda: key in self.results or key in self.errors, timeout):
+                raise TimeoutError(f"Page {page_number} ({phase}) not ready after {timeout}s")
+            if key in self.errors:
+                raise RuntimeError(self.errors[key])
+            return self.results[key]
+
+    def stop(self):
+        """
+        Stops the workers after their current render; queued work is dropped.
+        """
+        for _ in self.threads:
+            self.queue.put((-1, -1, None, None))
+        for thread in self.threads:
+            thread.join()
+
+
+if __name__ == "__main__":
+    pdf_path = "OCR_extraction.pdf"
+    poppler_path = r"D:\Program Files\poppler-24.08.0\Library\bin"
+    starttime = time.time()
+
+    def on_page(page_number, phase, array):
+        print(f"{time.time() - starttime:6.3f}s page {page_number} {phase} {array.shape[1]}x{array.shape[0]}")
+
+    renderer = PreviewRenderer(pdf_path, poppler_path=poppler_path, on_page=on_page).start(visible_pages=[1, 2])
+    # the user jumps to the last page while the previews are still rendering
+    renderer.get(renderer.total_pages, "full")
+    for page_number in range(1, renderer.total_pages + 1):
+        renderer.get(page_number, "full")
+    renderer.stop()
+    print(f"\nTotal execution time: {time.time() - starttime:.2f} seconds")
@@ -0,0 +1,83 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pdf2image import pdfinfo_from_path
+from PIL import Image
+from tiled_render import page_size_points, render_region, render_region_fitz
+
+
+def box_to_region(box, dpi, page_size=None):
+    """
+    Converts a crop box (left, upper, right, lower) in PDF points, origin at the
+    top-left like PIL crop boxes, into a pdftoppm pixel region (x, y, w, h).
+    If page_size is given the box is in fractions of the page (0-1) instead.
+    """
+    left, upper, right, lower = box
+    if page_size is not None:
+        width, height = page_size
+        left, right = left * width, right * width
+        upper, lower = upper * height, lower * height
+    scale = dpi / 72
+    x, y = math.floor(left * scale), math.floor(upper * scale)
+    return x, y, math.ceil(right * scale) - x, math.ceil(lower * scale) - y
+
+
+def _boxes_for_pages(boxes, pages):
+    # one template box (or list of boxes) for every page, or a {page_number: box(es)} dict
+    if isinstance(boxes, dict):
+        items = boxes.items()
+    else:
+        items = ((page_number, boxes) for page_number in pages)
+    for page_number, page_boxes in items:
+        if page_boxes and not isinstance(page_boxes[0], (list, tuple)):
+            page_boxes = [page_boxes]
+        for box in page_boxes:
+            yield page_number, tuple(box)
+
+
+def render_regions(pdf_path, boxes, dpi=300, first_page=None, last_page=None, poppler_path=None,
+                   relative=False, gray=False, backend="pdftoppm", max_workers=None):
+    """
+    Rasterizes only the requested crop boxes instead of whole pages.
+    boxes is either one box / list of boxes applied to every page, or a dict
+    mapping page numbers to a box / list of boxes. Returns {page_number: [PIL images]}.
+    """
+    if isinstance(boxes, dict):
+        pages = sorted(boxes)
+    else:
+        total_pages = pdfinfo_from_path(pdf_path, poppler_path=poppler_path)["Pages"]
+        pages = range(first_page or 1, (last_page or total_pages) + 1)
+
+    def render(page_number, box):
+        page_size = page_size_points(pdf_path, page_number, poppler_path) if relative else None
+        region = box_to_region(box, dpi, page_size)
+        if backend == "fitz":
+            array = render_region_fitz(pdf_path, page_number, dpi, region, gray)
+        else:
+            array = render_region(pdf_path, page_number, dpi, region, poppler_path, gray)
+        return page_number, Image.fromarray(array)
+
+    results = {page_number: [] for page_number in pages}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(render, page_number, box) for page_number, box in _boxes_for_pages(boxes, pages)]
+        for future in futures:
+            page_number, image = future.result()
+            results[page_number].append(image)
+    return results
+
+
+if __name__ == "__main__":
+    pdf_path = "OCR_extraction.pdf"
+    poppler_path = r"D:\Program Files\poppler-24.08.0\Library\bin"
+
+    # Header strip of every page: top 10% of the page, full width
+    starttime = time.time()
+    headers = render_regions(pdf_path, (0, 0, 1, 0.1), dpi=300, poppler_path=poppler_path, relative=True)
+    for page_number, images in headers.items():
+        for i, image in enumerate(images):
+            image.save(f"page_{page_number}_header_{i}.png", "PNG")
+    print(f"Rendered {len(headers)} headers in {time.time() - starttime:.2f} seconds")
+
+    # Signature box only on page 2, in points
+    signatures = render_regions(pdf_path, {2: (350, 700, 560, 800)}, dpi=300, poppler_path=poppler_path)
+    signatures[2][0].save("page_2_signature.png", "PNG")
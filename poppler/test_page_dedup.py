@@ -0,0 +1,49 @@
+import io
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from page_dedup import PageDeduplicator, process_pages
+
+A4_300DPI = (2480, 3508)
+
+
+def _page(lines=(), boxes=False, size=A4_300DPI):
+    page = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(page)
+    font = ImageFont.load_default(size=42)  # about 10pt at 300 dpi
+    if boxes:
+        for y in range(200, 3000, 120):
+            draw.rectangle((150, y, 2330, y + 80), outline="black", width=3)
+    for xy, text in lines:
+        draw.text(xy, text, fill="black", font=font)
+    return page
+
+
+def _scan(page, seed):
+    # what a second scan of the same sheet looks like: sensor noise and JPEG artifacts
+    noisy = np.asarray(page, dtype=np.int16) + np.random.default_rng(seed).normal(0, 6, (page.height, page.width, 1))
+    buffer = io.BytesIO()
+    Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8)).save(buffer, "JPEG", quality=85)
+    buffer.seek(0)
+    return Image.open(buffer).convert("RGB")
+
+
+def test_sparse_text_pages_are_not_blank():
+    deduplicator = PageDeduplicator()
+    assert deduplicator.classify(_page([((300, 3100), "Signed: J. Smith, 12 March 2024")]))[0] == "unique"
+    assert deduplicator.classify(_page([((1200, 3300), "Page 7")]))[0] == "unique"
+    assert deduplicator.classify(_page())[0] == "blank"
+    assert deduplicator.classify(_scan(_page(), seed=1))[0] == "blank"
+
+
+def test_forms_differing_in_one_field_are_kept(tmp_path):
+    pages = [_page([((1700, 2900), f"Total due: {total}")], boxes=True)
+             for total in ("1,240.00", "1,240.50", "1,240.00")]
+    statuses = [result["status"] for result in process_pages(pages, str(tmp_path))]
+    assert statuses == ["saved", "saved", "duplicate"]
+
+
+def test_rescanned_page_is_a_duplicate(tmp_path):
+    page = _page([((300, 400 + 60 * i), f"Line {i} of the terms and conditions") for i in range(30)])
+    results = process_pages([_scan(page, seed=1), _scan(page, seed=2)], str(tmp_path))
+    assert [result["status"] for result in results] == ["saved", "duplicate"]
+    assert results[1]["duplicate_of"] == 1
@@ -0,0 +1,297 @@
+import math
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import numpy as np
+from PIL import Image
+
+PNM_CHANNELS = {b"P5": 1, b"P6": 3}
+
+
+def poppler_binary(name, poppler_path=None):
+    return os.path.join(poppler_path, name) if poppler_path else name
+
+
+def pdftoppm_command(pdf_path, page_number, dpi, poppler_path=None, region=None, gray=False):
+    """
+    Builds a pdftoppm command that writes a single page as PPM/PGM to stdout.
+    region is (x, y, w, h) in pixels at the given dpi.
+    """
+    cmd = [
+        poppler_binary("pdftoppm", poppler_path),
+        "-r", str(dpi),
+        "-f", str(page_number),
+        "-l", str(page_number),
+        "-singlefile",
+    ]
+    if region is not None:
+        x, y, w, h = region
+        cmd += ["-x", str(x), "-y", str(y), "-W", str(w), "-H", str(h)]
+    if gray:
+        cmd.append("-gray")
+    cmd.append(pdf_path)
+    return cmd
+
+
+def run_pdftoppm(cmd, timeout=None):
+    """
+    Runs a pdftoppm command and returns its stdout. The subprocess is killed
+    if it does not finish within timeout seconds.
+    """
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(f"pdftoppm failed ({result.returncode}): {result.stderr.decode(errors='replace').strip()}")
+    return result.stdout
+
+
+def parse_pnm_header(buffer):
+    """
+    Parses a binary PGM/PPM header from the start of buffer.
+    Returns (width, height, channels, maxval, data_offset).
+    """
+    tokens = []
+    pos = 0
+    while len(tokens) < 4:
+        while buffer[pos:pos + 1].isspace():
+            pos += 1
+        if buffer[pos:pos + 1] == b"#":
+            newline = bytes(buffer[pos:pos + 256]).find(b"\n")
+            if newline < 0:
+                raise ValueError("Truncated PNM header")
+            pos += newline + 1
+            continue
+        end = pos
+        while end < len(buffer) and not buffer[end:end + 1].isspace():
+            end += 1
+        if end >= len(buffer):
+            raise ValueError("Truncated PNM header")
+        tokens.append(bytes(buffer[pos:end]))
+        pos = end
+    magic, width, height, maxval = tokens
+    if magic not in PNM_CHANNELS:
+        raise ValueError(f"Unsupported PNM type {magic!r}")
+    return int(width), int(height), PNM_CHANNELS[magic], int(maxval), pos + 1
+
+
+def pnm_to_array(data):
+    """
+    Wraps pdftoppm PPM/PGM output in a (H, W, C) or (H, W) uint8 array without decoding through PIL.
+    """
+    width, height, channels, maxval, offset = parse_pnm_header(data)
+    shape = (height, width) if channels == 1 else (height, width, channels)
+    return np.frombuffer(data, dtype=np.uint8, count=width * height * channels, offset=offset).reshape(shape)
+
+
+def page_size_points(pdf_path, page_number, poppler_path=None):
+    """
+    Returns the (width, height) of a page in PDF points, after page rotation, using pdfinfo.
+    """
+    result = subprocess.run(
+        [poppler_binary("pdfinfo", poppler_path), "-f", str(page_number), "-l", str(page_number), pdf_path],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+    )
+    width = height = None
+    rotation = 0
+    for line in result.stdout.decode(errors="replace").splitlines():
+        key, _, value = line.partition(":")
+        if key.split() == ["Page", str(page_number), "size"]:
+            parts = value.split()
+            width, height = float(parts[0]), float(parts[2])
+        elif key.split() == ["Page", str(page_number), "rot"]:
+            rotation = int(float(value))
+    if width is None:
+        raise ValueError(f"Could not read the size of page {page_number} from pdfinfo")
+    if rotation % 180 == 90:
+        width, height = height, width
+    return width, height
+
+
+def page_size_pixels(pdf_path, page_number, dpi, poppler_path=None, backend="pdftoppm"):
+    """
+    Returns the (width, height) in pixels of a page rendered at dpi.
+    """
+    if backend == "fitz":
+        import fitz  # PyMuPDF
+
+        with fitz.open(pdf_path) as doc:
+            rect = doc[page_number - 1].rect
+        width, height = rect.width, rect.height
+    else:
+        width, height = page_size_points(pdf_path, page_number, poppler_path)
+    return math.ceil(width * dpi / 72), math.ceil(height * dpi / 72)
+
+
+def tile_grid(width, height, tile_size):
+    """
+    Splits a width x height image into (x, y, w, h) tiles, row by row.
+    """
+    return [
+        (x, y, min(tile_size, width - x), min(tile_size, height - y))
+        for y in range(0, height, tile_size)
+        for x in range(0, width, tile_size)
+    ]
+
+
+def render_page(pdf_path, page_number, dpi, poppler_path=None, gray=False, timeout=None):
+    """
+    Rasterizes a whole page with pdftoppm and returns it as a uint8 array.
+    """
+    cmd = pdftoppm_command(pdf_path, page_number, dpi, poppler_path, gray=gray)
+    return pnm_to_array(run_pdftoppm(cmd, timeout))
+
+
+def render_region(pdf_path, page_number, dpi, region, poppler_path=None, gray=False, timeout=None):
+    """
+    Rasterizes only region (x, y, w, h in pixels at dpi) of a page with pdftoppm.
+    """
+    cmd = pdftoppm_command(pdf_path, page_number, dpi, poppler_path, region, gray)
+    return pnm_to_array(run_pdftoppm(cmd, timeout))
+
+
+def render_region_fitz(pdf_path, page_number, dpi, region, gray=False):
+    """
+    Rasterizes only region (x, y, w, h in pixels at dpi) of a page with PyMuPDF.
+    """
+    import fitz  # PyMuPDF
+
+    x, y, w, h = region
+    scale = 72 / dpi
+    with fitz.open(pdf_path) as doc:
+        page = doc[page_number - 1]
+        clip = fitz.Rect(x * scale, y * scale, (x + w) * scale, (y + h) * scale)
+        pix = page.get_pixmap(
+            matrix=fitz.Matrix(dpi / 72, dpi / 72), clip=clip, alpha=False,
+            colorspace=fitz.csGRAY if gray else fitz.csRGB,
+        )
+        shape = (pix.height, pix.width) if gray else (pix.height, pix.width, pix.n)
+        return np.frombuffer(pix.samples, dtype=np.uint8).reshape(shape)
+
+
+def _tile_executor(backend, max_workers):
+    # pdftoppm tiles are separate processes, so threads are enough; PyMuPDF needs processes
+    if backend == "fitz":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    return ThreadPoolExecutor(max_workers=max_workers or os.cpu_count())
+
+
+def render_tiles(pdf_path, page_number, dpi, tiles, max_workers=None, poppler_path=None,
+                 gray=False, backend="pdftoppm", timeout=None):
+    """
+    Renders the given (x, y, w, h) tiles of a page in parallel and yields
+    ((x, y, w, h), array) as each tile finishes. At most max_workers tiles are
+    in flight, so peak memory is bounded by the tile size, not the page size.
+    """
+    tiles = iter(tiles)
+    with _tile_executor(backend, max_workers) as executor:
+        in_flight = max_workers or os.cpu_count()
+
+        def submit(tile):
+            if backend == "fitz":
+                return executor.submit(render_region_fitz, pdf_path, page_number, dpi, tile, gray)
+            return executor.submit(render_region, pdf_path, page_number, dpi, tile, poppler_path, gray, timeout)
+
+        futures = {}
+        for tile in tiles:
+            futures[submit(tile)] = tile
+            if len(futures) >= in_flight:
+                break
+        while futures:
+            done = next(as_completed(futures))
+            tile = futures.pop(done)
+            yield tile, done.result()
+            for next_tile in tiles:
+                futures[submit(next_tile)] = next_tile
+                break
+
+
+def render_tiled(pdf_path, page_number, dpi, tile_size=2048, max_workers=None, poppler_path=None,
+                 gray=False, backend="pdftoppm", out_path=None):
+    """
+    Renders a page tile by tile and stitches the tiles into one preallocated
+    buffer. With out_path ending in .npy the buffer is a memory-mapped file.
+    """
+    width, height = page_size_pixels(pdf_path, page_number, dpi, poppler_path, backend)
+    shape = (height, width) if gray else (height, width, 3)
+    if out_path:
+        buffer = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.uint8, shape=shape)
+    else:
+        buffer = np.empty(shape, dtype=np.uint8)
+    for (x, y, w, h), tile in render_tiles(pdf_path, page_number, dpi, tile_grid(width, height, tile_size),
+                                           max_workers, poppler_path, gray, backend):
+        h, w = min(h, tile.shape[0]), min(w, tile.shape[1])
+        buffer[y:y + h, x:x + w] = tile[:h, :w]
+    if isinstance(buffer, np.memmap):
+        buffer.flush()
+    return buffer
+
+
+def _save_dzi_tile(img, files_dir, level, col, row, fmt):
+    level_dir = os.path.join(files_dir, str(level))
+    os.makedirs(level_dir, exist_ok=True)
+    img.save(os.path.join(level_dir, f"{col}_{row}.{fmt}"))
+
+
+def render_dzi(pdf_path, page_number, dpi, output_dir, name=None, dzi_tile_size=256, render_levels=3,
+               max_workers=None, poppler_path=None, fmt="png", backend="pdftoppm"):
+    """
+    Streams a page into a Deep Zoom (DZI) pyramid without holding the full page.
+    Render tiles are dzi_tile_size * 2**render_levels pixels wide, so the top
+    render_levels + 1 pyramid levels are cut straight out of each render tile;
+    the remaining levels are built from a page image 2**render_levels times smaller.
+    """
+    name = name or f"page_{page_number}"
+    files_dir = os.path.join(output_dir, f"{name}_files")
+    width, height = page_size_pixels(pdf_path, page_number, dpi, poppler_path, backend)
+    max_level = math.ceil(math.log2(max(width, height, 2)))
+    render_levels = min(render_levels, max_level)
+    render_tile = dzi_tile_size * 2 ** render_levels
+    small = Image.new("RGB", (math.ceil(width / 2 ** render_levels), math.ceil(height / 2 ** render_levels)), "white")
+    for (x, y, w, h), tile in render_tiles(pdf_path, page_number, dpi, tile_grid(width, height, render_tile),
+                                           max_workers, poppler_path, backend=backend):
+        img = Image.fromarray(tile)
+        for step in range(render_levels + 1):
+            scale = 2 ** (render_levels - step)
+            col0, row0 = x // render_tile * scale, y // render_tile * scale
+            for ty in range(0, img.height, dzi_tile_size):
+                for tx in range(0, img.width, dzi_tile_size):
+                    box = (tx, ty, min(tx + dzi_tile_size, img.width), min(ty + dzi_tile_size, img.height))
+                    _save_dzi_tile(img.crop(box), files_dir, max_level - step, col0 + tx // dzi_tile_size,
+                                   row0 + ty // dzi_tile_size, fmt)
+            if step < render_levels:
+                img = img.reduce(2)
+        small.paste(img, (x // render_tile * dzi_tile_size, y // render_tile * dzi_tile_size))
+    level = max_level - render_levels - 1
+    img = small
+    while level >= 0:
+        img = img.reduce(2)
+        for ty in range(0, img.height, dzi_tile_size):
+            for tx in range(0, img.width, dzi_tile_size):
+                box = (tx, ty, min(tx + dzi_tile_size, img.width), min(ty + dzi_tile_size, img.height))
+                _save_dzi_tile(img.crop(box), files_dir, level, tx // dzi_tile_size, ty // dzi_tile_size, fmt)
+        level -= 1
+    dzi_file = os.path.join(output_dir, f"{name}.dzi")
+    with open(dzi_file, "w") as f:
+        f.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" Format="{fmt}" '
+            f'Overlap="0" TileSize="{dzi_tile_size}">\n'
+            f'  <Size Width="{width}" Height="{height}"/>\n'
+            '</Image>\n'
+        )
+    return dzi_file
+
+
+if __name__ == "__main__":
+    pdf_path = "OCR_extraction.pdf"
+    poppler_path = r"D:\Program Files\poppler-24.08.0\Library\bin"
+    dpi = 500
+
+    starttime = time.time()
+    page = render_tiled(pdf_path, 1, dpi, tile_size=2048, poppler_path=poppler_path)
+    Image.fromarray(page).save("page_1_tiled.png")
+    print(f"Tiled render {page.shape[1]}x{page.shape[0]}: {time.time() - starttime:.2f} seconds")
+
+    starttime = time.time()
+    dzi_file = render_dzi(pdf_path, 1, dpi, "output", poppler_path=poppler_path)
+    print(f"Saved {dzi_file}: {time.time() - starttime:.2f} seconds")